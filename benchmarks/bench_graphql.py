@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Check that a nested clusters → OSDs → status notes GraphQL query runs a
+constant number of SQL queries however much data it returns.  The query is
+executed through NetBox's GraphQL view at each size in --sizes (OSDs per
+cluster); the script reports the query count and timing for each size, and
+exits non-zero if the counts differ.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_graphql.py [--output results.json]
+"""
+
+import argparse
+import json
+import sys
+
+from common import OSDS_PER_HOST, osd_records, rollback, seed_hosts, setup_django, timer, write_results
+
+CLUSTERS = 3
+NOTES_PER_OSD = 2
+
+QUERY = """
+{
+  ceph_cluster_list {
+    id
+    name
+    osds {
+      id
+      name
+      status
+      device { id name }
+      status_notes { id status reason resolved }
+    }
+  }
+}
+"""
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test import RequestFactory
+    from django.test.utils import CaptureQueriesContext
+    from netbox.graphql.schema import schema
+    from netbox.graphql.views import NetBoxGraphQLView
+
+    from netbox_osd.importers import CephOSDBulkImporter
+    from netbox_osd.models import CephCluster, CephOSD, CephOSDStatusNote
+
+    factory = RequestFactory()
+    view = NetBoxGraphQLView.as_view(schema=schema)
+
+    results = {}
+    for size in args.sizes:
+        with rollback():
+            user = get_user_model().objects.create(username="bench-user", is_superuser=True)
+            devices = seed_hosts((size + OSDS_PER_HOST - 1) // OSDS_PER_HOST * CLUSTERS)
+            importer = CephOSDBulkImporter()
+            for i in range(CLUSTERS):
+                cluster = CephCluster.objects.create(name=f"bench-cluster-{i}")
+                hosts = devices[i * len(devices) // CLUSTERS:(i + 1) * len(devices) // CLUSTERS]
+                importer.create(list(osd_records(hosts, size, cluster=cluster.name)))
+            CephOSDStatusNote.objects.bulk_create(
+                [
+                    CephOSDStatusNote(osd=osd, status="down", reason=f"bench note {n}")
+                    for osd in CephOSD.objects.all()
+                    for n in range(NOTES_PER_OSD)
+                ],
+                batch_size=2000,
+            )
+
+            request = factory.post("/graphql/", data=json.dumps({"query": QUERY}), content_type="application/json")
+            request.user = user
+            timings = {}
+            with CaptureQueriesContext(connection) as queries, timer(timings, "seconds"):
+                response = view(request)
+
+            data = json.loads(response.content)
+            assert "errors" not in data, data["errors"]
+            returned = sum(len(cluster["osds"]) for cluster in data["data"]["ceph_cluster_list"])
+            results[size] = {
+                "osds": returned,
+                "queries": len(queries),
+                "ms": round(timings["seconds"] * 1000, 1),
+            }
+            print(f"{size:>6} OSDs/cluster: {results[size]}")
+
+    write_results(results, args.output)
+    if len({result["queries"] for result in results.values()}) != 1:
+        print("Query count varies with the result size", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Capture EXPLAIN (ANALYZE, BUFFERS) plans for the plugin's list/filter queries
+at 100k OSDs and 1M status notes, with and without the indexes added in
+migration 0004_indexes.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_indexes.py [--out-dir explain/]
+
+Plans are written to <out-dir>/<query>-{with,without}-indexes.txt and a
+timing summary is printed as JSON.  The indexes are dropped inside the same
+transaction as the seeded data, so both are restored when it rolls back.
+"""
+
+import argparse
+import os
+import re
+
+from common import OSDS_PER_HOST, osd_records, rollback, seed_hosts, setup_django, write_results
+
+INDEXES = (
+    "netbox_osd_cluster_status",
+    "netbox_osd_status_type",
+    "netbox_osd_name_trgm",
+    "netbox_osd_note_created",
+    "netbox_osd_note_res_status",
+    "netbox_osd_note_open",
+    "netbox_osd_note_reason_trgm",
+)
+
+# Executed with a parameter, so the query uses mod() rather than a bare %
+SEED_NOTES_SQL = """
+INSERT INTO netbox_osd_cephosdstatusnote
+    (created, last_updated, custom_field_data, status, reason, resolved, osd_id)
+SELECT
+    now() - make_interval(mins => g),
+    now(),
+    '{}',
+    (ARRAY['down', 'out', 'maintenance', 'recovered', 'other'])[1 + mod(g, 5)],
+    'SMART errors on /dev/sd' || chr(97 + mod(g, 26)) || ' ticket #' || g,
+    mod(g, 20) <> 0,
+    ids.osd_ids[1 + mod(g, array_length(ids.osd_ids, 1))]
+FROM generate_series(1, %s) AS g,
+     (SELECT array_agg(id) AS osd_ids FROM netbox_osd_cephosd) AS ids
+"""
+
+
+def queries(cluster):
+    from netbox_osd.filtersets import CephOSDFilterSet, CephOSDStatusNoteFilterSet
+    from netbox_osd.models import CephOSD, CephOSDStatusNote
+
+    def osds(params):
+        return CephOSDFilterSet(params, CephOSD.objects.all()).qs
+
+    def notes(params):
+        return CephOSDStatusNoteFilterSet(params, CephOSDStatusNote.objects.all()).qs
+
+    return {
+        "osd_cluster_status": osds({"cluster_id": [cluster.pk], "status": ["down"]})[:50],
+        "osd_status_type": osds({"status": ["out"], "osd_type": ["nvme"]})[:50],
+        "osd_search": osds({"q": "osd.4242"})[:50],
+        "osd_open_note_count": CephOSD.objects.with_open_note_count().order_by("-open_note_count")[:50],
+        "note_list": notes({})[:50],
+        "note_unresolved": notes({"resolved": "false", "status": ["down"]})[:50],
+        "note_search": notes({"q": "ticket #424242"})[:50],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--osds", type=int, default=100_000)
+    parser.add_argument("--notes", type=int, default=1_000_000)
+    parser.add_argument("--out-dir", default="explain")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.db import connection
+    from netbox_osd.importers import CephOSDBulkImporter
+    from netbox_osd.models import CephCluster
+
+    os.makedirs(args.out_dir, exist_ok=True)
+    results = {}
+    with rollback():
+        devices = seed_hosts((args.osds + OSDS_PER_HOST - 1) // OSDS_PER_HOST)
+        cluster = CephCluster.objects.create(name="bench-cluster")
+        records = list(osd_records(devices, args.osds, cluster=cluster.name))
+        # 85% active; the rest spread over down/out/destroyed
+        statuses = ["active"] * 17 + ["down", "out", "destroyed"]
+        for i, record in enumerate(records):
+            record["status"] = statuses[i % len(statuses)]
+        CephOSDBulkImporter(chunk_size=5000).create(records)
+        with connection.cursor() as cursor:
+            cursor.execute(SEED_NOTES_SQL, [args.notes])
+            cursor.execute("ANALYZE netbox_osd_cephosd, netbox_osd_cephosdstatusnote")
+
+        for label in ("with", "without"):
+            if label == "without":
+                with connection.cursor() as cursor:
+                    for index in INDEXES:
+                        cursor.execute(f"DROP INDEX {index}")
+            for name, queryset in queries(cluster).items():
+                plan = queryset.explain(analyze=True, buffers=True)
+                with open(os.path.join(args.out_dir, f"{name}-{label}-indexes.txt"), "w") as f:
+                    f.write(f"{queryset.query}\n\n{plan}\n")
+                execution = re.search(r"Execution Time: ([\d.]+) ms", plan)
+                results.setdefault(name, {})[f"{label}_indexes_ms"] = float(execution.group(1))
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
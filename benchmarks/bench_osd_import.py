@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Benchmark CephOSDBulkImporter throughput (rows per second) at 1k, 10k and
+50k OSDs.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_osd_import.py [--output results.json]
+"""
+
+import argparse
+
+from common import OSDS_PER_HOST, osd_records, rollback, seed_hosts, setup_django, timer, write_results
+
+SIZES = (1_000, 10_000, 50_000)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--chunk-size", type=int, default=500)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from netbox_osd.importers import CephOSDBulkImporter
+    from netbox_osd.models import CephCluster
+
+    results = {}
+    for size in args.sizes:
+        with rollback():
+            devices = seed_hosts((size + OSDS_PER_HOST - 1) // OSDS_PER_HOST)
+            cluster = CephCluster.objects.create(name="bench-cluster")
+            records = list(osd_records(devices, size, cluster=cluster.name))
+
+            timings = {}
+            importer = CephOSDBulkImporter(chunk_size=args.chunk_size)
+            with timer(timings, "seconds"):
+                importer.create(records)
+
+            results[size] = {
+                "seconds": round(timings["seconds"], 3),
+                "rows_per_second": round(size / timings["seconds"]),
+            }
+            print(f"{size:>7} OSDs: {results[size]['rows_per_second']} rows/s")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
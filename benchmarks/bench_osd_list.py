@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark the OSD list endpoint: time to fetch and serialize 1,000 rows with
+the full CephOSDSerializer versus slim mode, with and without a sparse
+fieldset.  Each scenario is measured twice — through the API view
+(``GET /api/plugins/osd/osds/?limit=1000``, including rendering to JSON)
+and as serialization alone over rows already loaded from the database.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_osd_list.py [--output results.json]
+"""
+
+import argparse
+import statistics
+import time
+
+from common import OSDS_PER_HOST, osd_records, rollback, seed_hosts, setup_django, write_results
+
+PAGE_SIZE = 1000
+
+SCENARIOS = {
+    "full": {},
+    "slim": {"slim": "true"},
+    "slim_fields": {"slim": "true", "fields": "id,name,status"},
+    "full_fields": {"fields": "id,name,status"},
+}
+
+
+def measure(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return round(statistics.median(timings) * 1000, 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--osds", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory, force_authenticate
+
+    from netbox_osd.api.serializers import CephOSDSerializer, CephOSDSlimSerializer
+    from netbox_osd.api.views import CephOSDViewSet
+    from netbox_osd.importers import CephOSDBulkImporter
+    from netbox_osd.models import CephCluster, CephOSD
+
+    factory = APIRequestFactory()
+    list_view = CephOSDViewSet.as_view({"get": "list"})
+
+    results = {"rows": PAGE_SIZE}
+    with rollback():
+        user = get_user_model().objects.create(username="bench-user", is_superuser=True)
+        devices = seed_hosts((args.osds + OSDS_PER_HOST - 1) // OSDS_PER_HOST)
+        cluster = CephCluster.objects.create(name="bench-cluster")
+        CephOSDBulkImporter().create(list(osd_records(devices, args.osds, cluster=cluster.name)))
+
+        def call_view(params):
+            request = factory.get("/api/plugins/osd/osds/", {"limit": PAGE_SIZE, **params})
+            force_authenticate(request, user=user)
+            response = list_view(request)
+            response.render()
+            assert len(response.data["results"]) == PAGE_SIZE
+
+        context = {"request": Request(factory.get("/api/plugins/osd/osds/"))}
+        querysets = {
+            "full": CephOSD.objects.with_open_note_count().select_related("cluster", "device")
+            .prefetch_related("tags"),
+            "slim": CephOSD.objects.with_open_note_count().select_related("cluster", "device"),
+        }
+
+        for label, params in SCENARIOS.items():
+            with CaptureQueriesContext(connection) as queries:
+                call_view(params)
+
+            slim = "slim" in params
+            fields = params["fields"].split(",") if "fields" in params else None
+            serializer_class = CephOSDSlimSerializer if slim else CephOSDSerializer
+            rows = list(querysets["slim" if slim else "full"][:PAGE_SIZE])
+
+            def serialize():
+                kwargs = {"fields": fields} if fields else {}
+                return serializer_class(rows, many=True, context=context, **kwargs).data
+
+            results[label] = {
+                "view_ms": measure(lambda: call_view(params), args.repeat),
+                "serialize_ms": measure(serialize, args.repeat),
+                "queries": len(queries),
+            }
+            print(f"{label:>12}: {results[label]}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
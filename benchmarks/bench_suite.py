@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Time and query-count the plugin's UI views, API endpoints and import paths
+at 1k, 10k and 100k OSDs.
+
+For each size a topology is seeded with the ``seed_ceph_osds`` management
+command (24 OSDs per host, 20 hosts per rack, one status note per OSD).
+Every scenario is then requested through Django's test client, with the full
+middleware stack, and its median time, SQL query count and response status
+are recorded.  Write scenarios (imports, upserts, transitions) each run in a
+nested transaction that is rolled back, so they do not change the data the
+other scenarios see.
+
+Results are written as JSON keyed by size and scenario, so runs from two
+releases can be diffed directly.
+
+A separate ``heatmap`` topology (10,200 OSDs over 300 racks of two hosts)
+times the cluster heatmap with a cold cache, its worst case; the script
+exits non-zero if either heatmap takes longer than HEATMAP_BUDGET_MS.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_suite.py [--sizes 1000 10000] [--output results.json]
+"""
+
+import argparse
+import io
+import json
+import statistics
+import sys
+import time
+from contextlib import nullcontext
+
+from common import HOSTS_PER_RACK, OSDS_PER_HOST, rollback, setup_django, write_results
+
+SIZES = (1_000, 10_000, 100_000)
+PAGE_SIZE = 1000
+# Kept below the default background_job_threshold so imports run in the request
+IMPORT_ROWS = 500
+
+# Heatmap topology: many small racks, the shape which yields the most tiles
+HEATMAP_RACKS = 300
+HEATMAP_HOSTS_PER_RACK = 2
+HEATMAP_OSDS_PER_HOST = 17
+# Cold-cache time allowed for the heatmap page and API action
+HEATMAP_BUDGET_MS = 200
+
+
+def read_scenarios(ctx):
+    """
+    Read-only scenarios: name -> (method, path, data, extra headers).
+    """
+    cluster, device, rack = ctx["cluster"], ctx["device"], ctx["rack"]
+    return {
+        # UI views
+        "ui_osd_list": ("get", "/plugins/osd/osds/", {"per_page": 100}, {}),
+        "ui_osd_list_filtered": ("get", "/plugins/osd/osds/", {"status": "down", "per_page": 100}, {}),
+        "ui_cluster_list": ("get", "/plugins/osd/clusters/", {}, {}),
+        "ui_cluster_view": ("get", f"/plugins/osd/clusters/{cluster.pk}/", {}, {}),
+        "ui_cluster_heatmap": ("get", f"/plugins/osd/clusters/{cluster.pk}/heatmap/", {}, {}),
+        "ui_note_list": ("get", "/plugins/osd/notes/", {"per_page": 100}, {}),
+        # Device page with DeviceCephOSDPanel, and the panel's HTMX table
+        "ui_device_view": ("get", f"/dcim/devices/{device.pk}/", {}, {}),
+        "ui_device_osd_table": (
+            "get", "/plugins/osd/osds/", {"device_id": device.pk, "embedded": "true"}, {"HTTP_HX_REQUEST": "true"},
+        ),
+        # API endpoints
+        "api_osd_list": ("get", "/api/plugins/osd/osds/", {"limit": PAGE_SIZE}, {}),
+        "api_osd_list_brief": ("get", "/api/plugins/osd/osds/", {"limit": PAGE_SIZE, "brief": "true"}, {}),
+        "api_osd_list_slim": ("get", "/api/plugins/osd/osds/", {"limit": PAGE_SIZE, "slim": "true"}, {}),
+        "api_osd_list_cursor": (
+            "get", "/api/plugins/osd/osds/", {"limit": PAGE_SIZE, "pagination": "cursor"}, {},
+        ),
+        "api_osd_list_rack": ("get", "/api/plugins/osd/osds/", {"limit": PAGE_SIZE, "rack_id": rack.pk}, {}),
+        "api_osd_export": ("get", "/api/plugins/osd/osds/export/", {"cluster_id": cluster.pk}, {}),
+        "api_osd_availability": (
+            "get", "/api/plugins/osd/osds/availability/", {"cluster_id": cluster.pk, "group_by": "device"}, {},
+        ),
+        "api_cluster_list": ("get", "/api/plugins/osd/clusters/", {}, {}),
+        "api_cluster_summary": ("get", f"/api/plugins/osd/clusters/{cluster.pk}/summary/", {}, {}),
+        "api_cluster_capacity": ("get", f"/api/plugins/osd/clusters/{cluster.pk}/capacity/", {}, {}),
+        "api_cluster_heatmap": ("get", f"/api/plugins/osd/clusters/{cluster.pk}/heatmap/", {}, {}),
+        "api_note_list": ("get", "/api/plugins/osd/notes/", {"limit": PAGE_SIZE}, {}),
+        "api_metrics": ("get", "/api/plugins/osd/metrics/", {}, {}),
+    }
+
+
+def write_scenarios(ctx):
+    """
+    Scenarios which write data: name -> (method, path, data, extra headers).
+    """
+    devices, osds, cluster, rack = ctx["devices"], ctx["osds"], ctx["cluster"], ctx["rack"]
+    new_rows = [
+        f"osd.{1_000_000 + i},{cluster.name},{devices[i % len(devices)].name},hdd,false,active"
+        for i in range(IMPORT_ROWS)
+    ]
+    existing_rows = [f"{osd.name},{cluster.name},{osd.device.name},hdd,false,down" for osd in osds]
+    note_rows = [f"{osd.device.name},{osd.name},maintenance,Benchmark note,false" for osd in osds]
+    csv_form = {"format": "csv", "csv_delimiter": ","}
+    return {
+        "ui_osd_import": (
+            "post", "/plugins/osd/osds/import/",
+            {"data": "\n".join(["name,cluster,device,osd_type,encrypted,status", *new_rows]), **csv_form}, {},
+        ),
+        "ui_osd_upsert": (
+            "post", "/plugins/osd/osds/upsert/",
+            {"data": "\n".join(["name,cluster,device,osd_type,encrypted,status", *existing_rows]), **csv_form}, {},
+        ),
+        "ui_note_import": (
+            "post", "/plugins/osd/notes/import/",
+            {"data": "\n".join(["osd_device,osd_name,status,reason,resolved", *note_rows]), **csv_form}, {},
+        ),
+        "api_osd_upsert": (
+            "patch", "/api/plugins/osd/osds/upsert/",
+            [{"device": osd.device.name, "name": osd.name, "status": "down"} for osd in osds], {},
+        ),
+        "api_osd_transition": (
+            "post", "/api/plugins/osd/osds/transition/",
+            {"rack_id": [rack.pk], "status": "out", "reason": "Benchmark"}, {},
+        ),
+    }
+
+
+def request(client, method, path, data, headers):
+    if method == "get":
+        response = client.get(path, data, **headers)
+    elif path.startswith("/api/"):
+        response = getattr(client, method)(path, json.dumps(data), content_type="application/json", **headers)
+    else:
+        response = getattr(client, method)(path, data, **headers)
+    if response.streaming:
+        # Drain streamed exports so the whole body is generated
+        for _ in response.streaming_content:
+            pass
+    return response
+
+
+def measure(client, scenario, repeat, isolated, before=None):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+
+    timings = []
+    queries = None
+    status = None
+    for _ in range(repeat):
+        if before:
+            before()
+        with rollback() if isolated else nullcontext():
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = request(client, *scenario)
+                timings.append(time.perf_counter() - start)
+        queries = len(captured)
+        status = response.status_code
+    return {
+        "ms": round(statistics.median(timings) * 1000, 1),
+        "queries": queries,
+        "status": status,
+    }
+
+
+def call_seed(**options):
+    from django.core.management import call_command
+
+    call_command("seed_ceph_osds", notes_per_osd=1, stdout=io.StringIO(), **options)
+
+
+def heatmap_scenarios(client, repeat, only=None):
+    """
+    Seed the heatmap topology and time the heatmap page and API action with
+    the cached heatmap dropped before every request.
+    """
+    from django.core.cache import cache
+
+    from netbox_osd.models import CephCluster, CephOSD
+    from netbox_osd.summary import HEATMAP_CACHE_KEY
+
+    call_seed(
+        prefix="benchheatmap",
+        racks_per_site=HEATMAP_RACKS,
+        hosts_per_rack=HEATMAP_HOSTS_PER_RACK,
+        osds_per_host=HEATMAP_OSDS_PER_HOST,
+    )
+    cluster = CephCluster.objects.get(name="benchheatmap-cluster-00")
+    results = {"osds": CephOSD.objects.filter(cluster=cluster).count(), "racks": HEATMAP_RACKS}
+    scenarios = {
+        "ui_cluster_heatmap_cold": ("get", f"/plugins/osd/clusters/{cluster.pk}/heatmap/", {}, {}),
+        "api_cluster_heatmap_cold": ("get", f"/api/plugins/osd/clusters/{cluster.pk}/heatmap/", {}, {}),
+    }
+    for name, scenario in scenarios.items():
+        if only and name not in only:
+            continue
+        results[name] = measure(
+            client, scenario, repeat, False, before=lambda: cache.delete(HEATMAP_CACHE_KEY.format(cluster.pk))
+        )
+        print(f"{'heatmap':>7} {name:>24}: {results[name]}")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--only", nargs="+", help="Run only these scenarios")
+    parser.add_argument("--skip-heatmap", action="store_true", help="Skip the 300-rack heatmap scenarios")
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from django.contrib.auth import get_user_model
+    from django.test import Client, override_settings
+
+    from netbox_osd.models import CephCluster, CephOSD
+
+    results = {}
+    with override_settings(ALLOWED_HOSTS=["*"]):
+        for size in args.sizes:
+            with rollback():
+                hosts = (size + OSDS_PER_HOST - 1) // OSDS_PER_HOST
+                call_seed(
+                    prefix=f"bench{size}",
+                    racks_per_site=(hosts + HOSTS_PER_RACK - 1) // HOSTS_PER_RACK,
+                    hosts_per_rack=HOSTS_PER_RACK,
+                    osds_per_host=OSDS_PER_HOST,
+                )
+                user = get_user_model().objects.create(username=f"bench-user-{size}", is_superuser=True)
+                client = Client()
+                client.force_login(user)
+
+                cluster = CephCluster.objects.get(name=f"bench{size}-cluster-00")
+                osds = list(CephOSD.objects.filter(cluster=cluster).select_related("device")[:IMPORT_ROWS])
+                ctx = {
+                    "cluster": cluster,
+                    "osds": osds,
+                    "device": osds[0].device,
+                    "devices": list({osd.device_id: osd.device for osd in osds}.values()),
+                    "rack": osds[0].device.rack,
+                }
+
+                results[size] = {"osds": CephOSD.objects.filter(cluster=cluster).count()}
+                for isolated, scenarios in ((False, read_scenarios(ctx)), (True, write_scenarios(ctx))):
+                    for name, scenario in scenarios.items():
+                        if args.only and name not in args.only:
+                            continue
+                        results[size][name] = measure(client, scenario, args.repeat, isolated)
+                        print(f"{size:>7} {name:>24}: {results[size][name]}")
+
+        if not args.skip_heatmap:
+            with rollback():
+                user = get_user_model().objects.create(username="bench-user-heatmap", is_superuser=True)
+                client = Client()
+                client.force_login(user)
+                results["heatmap"] = heatmap_scenarios(client, args.repeat, args.only)
+
+    write_results(results, args.output)
+
+    if over := [
+        name for name, result in results.get("heatmap", {}).items()
+        if isinstance(result, dict) and result["ms"] > HEATMAP_BUDGET_MS
+    ]:
+        print(f"Cold-cache heatmap over {HEATMAP_BUDGET_MS} ms: {', '.join(over)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Benchmark CephSync against the recorded 5,000-OSD fixtures: an initial sync
+that creates every OSD, then a delta sync from a second snapshot in which a
+different ~3% of OSDs are down or out.
+
+Usage:
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_sync.py [--output results.json]
+"""
+
+import argparse
+import gzip
+import json
+import os
+
+from common import OSDS_PER_HOST, rollback, seed_hosts, setup_django, timer, write_results
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+
+
+def load_fixture(name):
+    with gzip.open(os.path.join(FIXTURES, name), "rt") as f:
+        return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--osds", type=int, default=5000)
+    parser.add_argument("--output")
+    args = parser.parse_args()
+
+    setup_django()
+    from netbox_osd.models import CephCluster
+    from netbox_osd.sync import CephSync
+
+    snapshots = [
+        (load_fixture(f"osd_tree-{args.osds}.json.gz"), load_fixture(f"osd_dump-{args.osds}.json.gz")),
+        (load_fixture(f"osd_tree-{args.osds}-seed1.json.gz"), load_fixture(f"osd_dump-{args.osds}-seed1.json.gz")),
+    ]
+
+    results = {}
+    with rollback():
+        seed_hosts((args.osds + OSDS_PER_HOST - 1) // OSDS_PER_HOST)
+        cluster = CephCluster.objects.create(name="bench-cluster")
+        sync = CephSync(cluster)
+
+        for label, (tree, dump) in zip(("initial", "delta", "no_op"), snapshots + snapshots[1:]):
+            timings = {}
+            with timer(timings, "seconds"):
+                summary = sync.run(tree, dump)
+            results[label] = {"seconds": round(timings["seconds"], 3), **summary}
+            print(f"{label:>8}: {results[label]}")
+
+    write_results(results, args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+"""
+Shared helpers for the netbox_osd benchmark scripts.
+
+The benchmarks run against a real NetBox installation with the plugin
+enabled.  Point NETBOX_ROOT at the directory containing manage.py:
+
+    NETBOX_ROOT=/opt/netbox/netbox python benchmarks/bench_osd_import.py
+
+All data is created inside a transaction which is rolled back afterwards.
+"""
+
+import json
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+HOSTS_PER_RACK = 20
+OSDS_PER_HOST = 24
+
+
+def setup_django():
+    sys.path.insert(0, os.environ.get("NETBOX_ROOT", "/opt/netbox/netbox"))
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "netbox.settings")
+
+    import django
+    django.setup()
+
+
+class Rollback(Exception):
+    pass
+
+
+@contextmanager
+def rollback():
+    """
+    Run the enclosed block in a transaction that is always rolled back.
+    """
+    from django.db import transaction
+
+    try:
+        with transaction.atomic():
+            yield
+            raise Rollback
+    except Rollback:
+        pass
+
+
+@contextmanager
+def timer(results, key):
+    start = time.perf_counter()
+    yield
+    results[key] = time.perf_counter() - start
+
+
+def seed_hosts(count, prefix="bench"):
+    """
+    Create `count` storage hosts (and the site, racks and device type they
+    need) with bulk_create.  Returns the list of Devices.
+    """
+    from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+
+    site = Site.objects.create(name=f"{prefix}-site", slug=f"{prefix}-site")
+    manufacturer = Manufacturer.objects.create(name=f"{prefix}-mfr", slug=f"{prefix}-mfr")
+    device_type = DeviceType.objects.create(manufacturer=manufacturer, model=f"{prefix}-jbod", slug=f"{prefix}-jbod")
+    role = DeviceRole.objects.create(name=f"{prefix}-storage", slug=f"{prefix}-storage")
+
+    racks = Rack.objects.bulk_create([
+        Rack(site=site, name=f"{prefix}-rack-{i:04d}")
+        for i in range((count + HOSTS_PER_RACK - 1) // HOSTS_PER_RACK)
+    ])
+    return Device.objects.bulk_create([
+        Device(
+            site=site,
+            rack=racks[i // HOSTS_PER_RACK],
+            device_type=device_type,
+            role=role,
+            name=f"{prefix}-host-{i:05d}",
+        )
+        for i in range(count)
+    ])
+
+
+def osd_records(devices, count, cluster=None):
+    """
+    Yield `count` CSV-style OSD records spread over `devices`.
+    """
+    for i in range(count):
+        yield {
+            "name": f"osd.{i}",
+            "cluster": cluster or "",
+            "device": devices[i // OSDS_PER_HOST].name,
+            "osd_type": ("hdd", "ssd", "nvme")[i % 3],
+            "encrypted": "true" if i % 2 else "false",
+            "status": "active",
+            "description": "",
+        }
+
+
+def write_results(results, path=None):
+    output = json.dumps(results, indent=2)
+    if path:
+        with open(path, "w") as f:
+            f.write(output)
+    print(output)
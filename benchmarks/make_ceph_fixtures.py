@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Generate deterministic `ceph osd tree -f json` / `ceph osd dump -f json`
+fixtures for offline sync tests and benchmarks.
+
+Usage:
+    python benchmarks/make_ceph_fixtures.py --osds 5000 --out-dir benchmarks/fixtures
+
+The recorded 5,000-OSD fixtures in benchmarks/fixtures/ were produced with
+seeds 0 and 1.
+Hosts are named <prefix>-host-NNNNN, matching common.seed_hosts(), with
+OSDS_PER_HOST OSDs each.  Roughly 2% of OSDs are down and 1% out; --seed
+changes which ones, so two fixtures with different seeds produce a delta.
+"""
+
+import argparse
+import gzip
+import io
+import json
+import os
+import random
+import uuid
+
+from common import OSDS_PER_HOST
+
+DEVICE_CLASSES = ("hdd", "ssd", "nvme")
+
+
+def make_fixtures(osds, prefix="bench", seed=0):
+    rng = random.Random(seed)
+    host_count = (osds + OSDS_PER_HOST - 1) // OSDS_PER_HOST
+
+    nodes = [{
+        "id": -1,
+        "name": "default",
+        "type": "root",
+        "type_id": 11,
+        "children": [-(i + 2) for i in range(host_count)],
+    }]
+    dump_osds = []
+    for host in range(host_count):
+        children = list(range(host * OSDS_PER_HOST, min((host + 1) * OSDS_PER_HOST, osds)))
+        nodes.append({
+            "id": -(host + 2),
+            "name": f"{prefix}-host-{host:05d}",
+            "type": "host",
+            "type_id": 1,
+            "pool_weights": {},
+            "children": children[::-1],
+        })
+        for osd_id in children:
+            roll = rng.random()
+            up = int(roll >= 0.02)
+            in_ = int(not 0.02 <= roll < 0.03)
+            nodes.append({
+                "id": osd_id,
+                "device_class": DEVICE_CLASSES[osd_id % 3],
+                "name": f"osd.{osd_id}",
+                "type": "osd",
+                "type_id": 0,
+                "crush_weight": 7.27739,
+                "depth": 2,
+                "pool_weights": {},
+                "exists": 1,
+                "status": "up" if up else "down",
+                "reweight": float(in_),
+                "primary_affinity": 1,
+            })
+            dump_osds.append({
+                "osd": osd_id,
+                "uuid": str(uuid.UUID(int=rng.getrandbits(128))),
+                "up": up,
+                "in": in_,
+                "weight": float(in_),
+                "primary_affinity": 1,
+                "state": ["exists", "up"] if up else ["exists"],
+            })
+
+    tree = {"nodes": nodes, "stray": []}
+    dump = {"epoch": 1000 + seed, "fsid": str(uuid.UUID(int=seed)), "osds": dump_osds}
+    return tree, dump
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--osds", type=int, default=5000)
+    parser.add_argument("--prefix", default="bench")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out-dir", default=os.path.join(os.path.dirname(__file__), "fixtures"))
+    args = parser.parse_args()
+
+    tree, dump = make_fixtures(args.osds, prefix=args.prefix, seed=args.seed)
+    suffix = f"{args.osds}" if not args.seed else f"{args.osds}-seed{args.seed}"
+    for name, data in (("osd_tree", tree), ("osd_dump", dump)):
+        path = os.path.join(args.out_dir, f"{name}-{suffix}.json.gz")
+        # mtime=0 keeps the compressed output byte-for-byte reproducible
+        with gzip.GzipFile(path, "wb", mtime=0) as raw, io.TextIOWrapper(raw) as f:
+            json.dump(data, f, separators=(",", ":"))
+        print(f"Wrote {path}")
+
+
+if __name__ == "__main__":
+    main()
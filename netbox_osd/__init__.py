@@ -8,8 +8,27 @@ class NetBoxOSDConfig(PluginConfig):
     version = "0.1.0"
     author = "Ognjen"
     base_url = "osd"
-    min_version = "4.0.0"
-    default_settings = {}
+    min_version = "4.2.0"
+    graphql_schema = "graphql.schema.schema"
+    default_settings = {
+        # CSV uploads with at least this many OSD rows use the bulk import engine
+        "bulk_import_threshold": 100,
+        # Upper bound (in seconds) on how long a cached cluster summary is kept
+        "summary_cache_timeout": 300,
+        # Imports and bulk edits of at least this many rows run as background
+        # jobs; None keeps them in the web request
+        "background_job_threshold": 1000,
+        # How long (in seconds) the Prometheus metrics text is cached
+        "metrics_cache_timeout": 15,
+        # Measure query counts and timings of plugin views, API endpoints and
+        # template extensions, reported in response headers and logs
+        "instrument": False,
+    }
+    middleware = ["netbox_osd.instrumentation.InstrumentationMiddleware"]
+
+    def ready(self):
+        super().ready()
+        from . import signals  # noqa: F401
 
 
 config = NetBoxOSDConfig
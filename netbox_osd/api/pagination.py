@@ -0,0 +1,134 @@
+import base64
+import binascii
+import json
+
+from django.db.models import Q
+from netbox.config import get_config
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorPagination(BasePagination):
+    """
+    Forward-only keyset pagination.  Each page is fetched with a
+    ``WHERE (created, id) > (…)``-style condition on the last row of the
+    previous page rather than an OFFSET, so every page costs the same
+    regardless of depth and rows written mid-walk cannot shift page
+    boundaries.
+
+    The ordering is picked with ``?ordering=`` from the view's
+    ``cursor_orderings``; its key columns must be covered by an index.
+    Responses carry ``next`` and ``results`` but no ``count``.
+    """
+    cursor_query_param = "cursor"
+    limit_query_param = "limit"
+    ordering_query_param = "ordering"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.limit = self.get_limit(request)
+        self.ordering = self.get_ordering(request, view)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position := self.decode_cursor(request):
+            queryset = queryset.filter(self.get_position_filter(position))
+
+        results = list(queryset[:self.limit + 1])
+        self.next_position = None
+        if len(results) > self.limit:
+            results = results[:self.limit]
+            self.next_position = [getattr(results[-1], field) for field in self.ordering]
+        return results
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": None,
+            "results": data,
+        })
+
+    def get_limit(self, request):
+        config = get_config()
+        try:
+            limit = int(request.query_params.get(self.limit_query_param, config.PAGINATE_COUNT))
+        except ValueError:
+            limit = config.PAGINATE_COUNT
+        if limit <= 0:
+            limit = config.PAGINATE_COUNT
+        if config.MAX_PAGE_SIZE:
+            limit = min(limit, config.MAX_PAGE_SIZE)
+        return limit
+
+    def get_ordering(self, request, view):
+        orderings = view.cursor_orderings
+        key = request.query_params.get(self.ordering_query_param) or next(iter(orderings))
+        if key not in orderings:
+            raise ValidationError({
+                self.ordering_query_param: f"Cursor pagination supports ordering by: {', '.join(orderings)}"
+            })
+        return orderings[key]
+
+    def get_position_filter(self, position):
+        """
+        Return the lexicographic "after `position`" condition on the ordering
+        columns.  The leading ``>=`` on the first column lets the database
+        start an index range scan at the cursor.
+        """
+        condition = Q()
+        for i, field in enumerate(self.ordering):
+            term = Q(**{f"{field}__gt": position[i]})
+            for previous, value in zip(self.ordering[:i], position):
+                term &= Q(**{previous: value})
+            condition |= term
+        return Q(**{f"{self.ordering[0]}__gte": position[0]}) & condition
+
+    def decode_cursor(self, request):
+        if not (cursor := request.query_params.get(self.cursor_query_param)):
+            return None
+        try:
+            position = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound("Invalid cursor")
+        if not isinstance(position, list) or len(position) != len(self.ordering):
+            raise NotFound("Invalid cursor")
+        return position
+
+    def encode_cursor(self, position):
+        position = [value.isoformat() if hasattr(value, "isoformat") else value for value in position]
+        return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor returned in the previous page's next link.",
+                "schema": {"type": "string"},
+            },
+        ]
+
+
+class CursorPaginationMixin:
+    """
+    Let API clients opt into CursorPagination with ``?pagination=cursor``;
+    requests without it keep NetBox's limit/offset pagination.
+    """
+    cursor_orderings = {"id": ("id",)}
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.request.query_params.get("pagination") == "cursor":
+                self._paginator = CursorPagination()
+            else:
+                self._paginator = super().paginator
+        return self._paginator
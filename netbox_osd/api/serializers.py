@@ -1,7 +1,13 @@
+from datetime import timedelta
+
+from django.urls import reverse
+from django.utils.functional import cached_property
+from django.utils.timezone import now
 from netbox.api.serializers import NetBoxModelSerializer
 from rest_framework import serializers
 from dcim.api.serializers import DeviceSerializer
 
+from ..choices import OSDStatusChoices, OSDTypeChoices
 from ..models import CephCluster, CephOSD, CephOSDStatusNote
 
 
@@ -9,6 +15,15 @@ class CephClusterSerializer(NetBoxModelSerializer):
     url = serializers.HyperlinkedIdentityField(
         view_name="plugins-api:netbox_osd-api:cephcluster-detail"
     )
+    node_count = serializers.IntegerField(read_only=True)
+    osd_count = serializers.IntegerField(read_only=True)
+    active_count = serializers.IntegerField(read_only=True)
+    down_count = serializers.IntegerField(read_only=True)
+    out_count = serializers.IntegerField(read_only=True)
+    destroyed_count = serializers.IntegerField(read_only=True)
+    hdd_count = serializers.IntegerField(read_only=True)
+    ssd_count = serializers.IntegerField(read_only=True)
+    nvme_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = CephCluster
@@ -18,6 +33,15 @@ class CephClusterSerializer(NetBoxModelSerializer):
             "display",
             "name",
             "description",
+            "node_count",
+            "osd_count",
+            "active_count",
+            "down_count",
+            "out_count",
+            "destroyed_count",
+            "hdd_count",
+            "ssd_count",
+            "nvme_count",
             "tags",
             "custom_fields",
             "created",
@@ -32,6 +56,7 @@ class CephOSDSerializer(NetBoxModelSerializer):
     )
     cluster = CephClusterSerializer(nested=True, required=False, allow_null=True)
     device = DeviceSerializer(nested=True)
+    open_note_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = CephOSD
@@ -41,17 +66,161 @@ class CephOSDSerializer(NetBoxModelSerializer):
             "display",
             "cluster",
             "name",
+            "osd_id",
             "device",
             "osd_type",
             "encrypted",
             "status",
+            "size_bytes",
+            "used_bytes",
+            "crush_weight",
+            "reweight",
+            "open_note_count",
             "description",
             "tags",
             "custom_fields",
             "created",
             "last_updated",
         ]
-        brief_fields = ["id", "url", "display", "name", "cluster", "device", "status"]
+        brief_fields = ["id", "url", "display", "name", "osd_id", "cluster", "device", "status"]
+
+
+class CephOSDSlimSerializer(serializers.Serializer):
+    """
+    Lean, read-only representation of CephOSD for large list responses
+    (``?slim=true``).  Each row is rendered straight from the model instance:
+    the cluster and device are reduced to ``{id, name, url}`` and all URLs
+    are built from prefixes resolved once per response instead of once per
+    row.  Tags and custom fields are not included.
+
+    Accepts the same ``fields`` argument as NetBox's dynamic serializers.
+    """
+    datetime_field = serializers.DateTimeField()
+    # Rendered as CephOSDSerializer renders them (strings, with
+    # COERCE_DECIMAL_TO_STRING), so the type doesn't depend on ?slim
+    decimal_fields = {
+        "crush_weight": serializers.DecimalField(max_digits=10, decimal_places=5),
+        "reweight": serializers.DecimalField(max_digits=6, decimal_places=5),
+    }
+    osd_type_labels = dict(OSDTypeChoices)
+    status_labels = dict(OSDStatusChoices)
+
+    class Meta:
+        model = CephOSD
+        fields = [
+            "id",
+            "url",
+            "display",
+            "cluster",
+            "name",
+            "osd_id",
+            "device",
+            "osd_type",
+            "encrypted",
+            "status",
+            "size_bytes",
+            "used_bytes",
+            "crush_weight",
+            "reweight",
+            "open_note_count",
+            "description",
+            "created",
+            "last_updated",
+        ]
+        brief_fields = ["id", "url", "display", "name", "osd_id", "cluster", "device", "status"]
+
+    def __init__(self, *args, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if fields:
+            self.requested_fields = [field for field in self.Meta.fields if field in fields]
+        else:
+            self.requested_fields = self.Meta.fields
+
+    @cached_property
+    def url_prefixes(self):
+        request = self.context.get("request")
+        prefixes = {}
+        for key, view_name in (
+            ("osd", "plugins-api:netbox_osd-api:cephosd-list"),
+            ("cluster", "plugins-api:netbox_osd-api:cephcluster-list"),
+            ("device", "dcim-api:device-list"),
+        ):
+            url = reverse(view_name)
+            prefixes[key] = request.build_absolute_uri(url) if request else url
+        return prefixes
+
+    def to_representation(self, instance):
+        data = {}
+        for field in self.requested_fields:
+            if field == "url":
+                data[field] = f"{self.url_prefixes['osd']}{instance.pk}/"
+            elif field == "display":
+                data[field] = str(instance)
+            elif field in ("cluster", "device"):
+                data[field] = self.get_related(getattr(instance, field), self.url_prefixes[field])
+            elif field == "osd_type":
+                data[field] = {"value": instance.osd_type, "label": self.osd_type_labels.get(instance.osd_type)}
+            elif field == "status":
+                data[field] = {"value": instance.status, "label": self.status_labels.get(instance.status)}
+            elif field in ("created", "last_updated"):
+                value = getattr(instance, field)
+                data[field] = self.datetime_field.to_representation(value) if value else None
+            elif field in self.decimal_fields:
+                value = getattr(instance, field)
+                data[field] = self.decimal_fields[field].to_representation(value) if value is not None else None
+            else:
+                data[field] = getattr(instance, field, None)
+        return data
+
+    @staticmethod
+    def get_related(obj, url_prefix):
+        if obj is None:
+            return None
+        return {"id": obj.pk, "name": obj.name, "url": f"{url_prefix}{obj.pk}/"}
+
+
+class CephOSDTransitionSerializer(serializers.Serializer):
+    """
+    Input for the bulk status transition action.  OSDs are selected with
+    CephOSDFilterSet parameters, of which at least one is required.
+    """
+    filter_fields = ("id", "device", "device_id", "rack_id", "cluster", "cluster_id")
+
+    status = serializers.ChoiceField(choices=OSDStatusChoices)
+    reason = serializers.CharField(required=False, allow_blank=True, default="")
+    id = serializers.ListField(child=serializers.IntegerField(), required=False)
+    device = serializers.ListField(child=serializers.CharField(), required=False)
+    device_id = serializers.ListField(child=serializers.IntegerField(), required=False)
+    rack_id = serializers.ListField(child=serializers.IntegerField(), required=False)
+    cluster = serializers.ListField(child=serializers.CharField(), required=False)
+    cluster_id = serializers.ListField(child=serializers.IntegerField(), required=False)
+
+    def validate(self, data):
+        if not any(data.get(field) for field in self.filter_fields):
+            raise serializers.ValidationError(
+                f"Select OSDs with at least one of: {', '.join(self.filter_fields)}"
+            )
+        return data
+
+
+class CephOSDHistoryRangeSerializer(serializers.Serializer):
+    """
+    Query parameters for the OSD status history endpoints: a ``start`` and
+    ``end`` timestamp, defaulting to the last seven days, and for the
+    availability report a ``group_by`` of osd, device or cluster.
+    """
+    default_range = timedelta(days=7)
+
+    start = serializers.DateTimeField(required=False)
+    end = serializers.DateTimeField(required=False)
+    group_by = serializers.ChoiceField(choices=("osd", "device", "cluster"), default="osd")
+
+    def validate(self, data):
+        data.setdefault("end", now())
+        data.setdefault("start", data["end"] - self.default_range)
+        if data["start"] >= data["end"]:
+            raise serializers.ValidationError({"end": "end must be later than start."})
+        return data
 
 
 class CephOSDStatusNoteSerializer(NetBoxModelSerializer):
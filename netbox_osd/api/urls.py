@@ -1,3 +1,4 @@
+from django.urls import path
 from netbox.api.routers import NetBoxRouter
 
 from . import views
@@ -9,4 +10,7 @@ router.register("clusters", views.CephClusterViewSet, basename="cephcluster")
 router.register("osds", views.CephOSDViewSet, basename="cephosd")
 router.register("notes", views.CephOSDStatusNoteViewSet, basename="cephosdsstatusnote")
 
-urlpatterns = router.urls
+urlpatterns = [
+    path("metrics/", views.CephMetricsView.as_view(), name="metrics"),
+    *router.urls,
+]
@@ -1,23 +1,296 @@
+from core.api.serializers import JobSerializer
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.shortcuts import get_object_or_404
+from netbox.api.authentication import IsAuthenticatedOrLoginNotRequired
 from netbox.api.viewsets import NetBoxModelViewSet
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from utilities.exceptions import PermissionsViolation
 
 from ..filtersets import CephClusterFilterSet, CephOSDFilterSet, CephOSDStatusNoteFilterSet
+from ..history import osd_history, time_in_state
+from ..importers import CephOSDBulkImporter
+from ..jobs import CephSyncJob
+from ..metrics import get_metrics
 from ..models import CephCluster, CephOSD, CephOSDStatusNote
-from .serializers import CephClusterSerializer, CephOSDSerializer, CephOSDStatusNoteSerializer
+from ..summary import get_capacity, get_heatmap, get_summary
+from ..transitions import CephOSDTransition
+from .export import ExportMixin, PrometheusRenderer
+from .pagination import CursorPaginationMixin
+from .serializers import (
+    CephClusterSerializer,
+    CephOSDHistoryRangeSerializer,
+    CephOSDSerializer,
+    CephOSDSlimSerializer,
+    CephOSDStatusNoteSerializer,
+    CephOSDTransitionSerializer,
+)
 
 
 class CephClusterViewSet(NetBoxModelViewSet):
-    queryset = CephCluster.objects.prefetch_related("tags")
+    queryset = CephCluster.objects.with_counts().prefetch_related("tags")
     serializer_class = CephClusterSerializer
     filterset_class = CephClusterFilterSet
 
+    @action(detail=True, methods=["get"])
+    def summary(self, request, pk):
+        """
+        Return the cluster's cached health summary: node and OSD counts by
+        status, type and encryption, plus the number of open status notes.
+        """
+        # Look the cluster up without the aggregate annotations of the viewset queryset
+        cluster = get_object_or_404(CephCluster.objects.restrict(request.user, "view"), pk=pk)
+        return Response(get_summary(cluster.pk))
 
-class CephOSDViewSet(NetBoxModelViewSet):
-    queryset = CephOSD.objects.prefetch_related("cluster", "device__rack", "device__site", "tags")
+    @action(detail=True, methods=["get"])
+    def capacity(self, request, pk):
+        """
+        Return the cluster's raw capacity by device class: total, used and
+        available bytes, and the capacity of OSDs which are down or out.
+        """
+        cluster = get_object_or_404(CephCluster.objects.restrict(request.user, "view"), pk=pk)
+        return Response(get_capacity(cluster.pk))
+
+    @action(detail=True, methods=["get"])
+    def heatmap(self, request, pk):
+        """
+        Return the cluster's OSD counts by status for every site, rack and
+        host, with the share of OSDs down or out at each level.
+        """
+        cluster = get_object_or_404(CephCluster.objects.restrict(request.user, "view"), pk=pk)
+        return Response(get_heatmap(cluster.pk))
+
+    @action(detail=True, methods=["post"])
+    def sync(self, request, pk):
+        """
+        Enqueue a background sync of this cluster's OSDs from the JSON output
+        of ``ceph osd tree`` and ``ceph osd dump``, posted as ``tree`` and
+        ``dump``.
+        """
+        if not request.user.has_perms(["netbox_osd.add_cephosd", "netbox_osd.change_cephosd"]):
+            raise PermissionDenied
+        tree = request.data.get("tree")
+        dump = request.data.get("dump")
+        if not isinstance(tree, dict) or not isinstance(dump, dict):
+            return Response(
+                {"detail": "Both 'tree' and 'dump' must be JSON objects."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        cluster = get_object_or_404(CephCluster.objects.restrict(request.user, "change"), pk=pk)
+        job = CephSyncJob.enqueue(instance=cluster, user=request.user, tree=tree, dump=dump)
+        return Response(
+            JobSerializer(job, context={"request": request}).data,
+            status=status.HTTP_202_ACCEPTED,
+        )
+
+
+class CephOSDViewSet(ExportMixin, CursorPaginationMixin, NetBoxModelViewSet):
+    queryset = CephOSD.objects.select_related("cluster", "device").prefetch_related("tags")
     serializer_class = CephOSDSerializer
     filterset_class = CephOSDFilterSet
+    export_filename = "ceph-osds"
+    export_columns = (
+        ("id", "pk"),
+        ("name", "name"),
+        ("osd_id", "osd_id"),
+        ("cluster", "cluster__name"),
+        ("device", "device__name"),
+        ("rack", "device__rack__name"),
+        ("site", "device__site__name"),
+        ("osd_type", "osd_type"),
+        ("encrypted", "encrypted"),
+        ("status", "status"),
+        ("size_bytes", "size_bytes"),
+        ("used_bytes", "used_bytes"),
+        ("crush_weight", "crush_weight"),
+        ("reweight", "reweight"),
+        ("description", "description"),
+        ("created", "created"),
+        ("last_updated", "last_updated"),
+    )
+    slim = False
+
+    def initialize_request(self, request, *args, **kwargs):
+        request = super().initialize_request(request, *args, **kwargs)
+        # Slim mode (?slim=true) renders list responses with CephOSDSlimSerializer
+        self.slim = self.action == "list" and request.GET.get("slim", "").lower() in ("true", "1") and not self.brief
+        return request
+
+    def get_serializer_class(self):
+        if self.slim:
+            return CephOSDSlimSerializer
+        return super().get_serializer_class()
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        fields = self.requested_fields or self.get_serializer_class().Meta.fields
+        if "open_note_count" in fields:
+            queryset = queryset.with_open_note_count()
+        if self.slim:
+            # Join only the relations the requested fields render; the device
+            # is also needed for the display string.
+            related = {"cluster"} & set(fields)
+            if "device" in fields or "display" in fields:
+                related.add("device")
+            queryset = queryset.prefetch_related(None).select_related(None)
+            if related:
+                queryset = queryset.select_related(*related)
+        return queryset
+
+    @action(detail=False, methods=["put", "patch"], url_path="upsert")
+    def upsert(self, request):
+        """
+        Create or update a list of OSDs keyed on (device, name).  ``device``
+        and ``cluster`` may be given by name or ID.  PUT resets omitted fields
+        to their defaults; PATCH leaves them unchanged.
+        """
+        records = request.data
+        if not isinstance(records, list) or not all(isinstance(record, dict) for record in records):
+            return Response({"detail": "Expected a list of OSD objects."}, status=status.HTTP_400_BAD_REQUEST)
+        if not CephOSDBulkImporter.supports(records):
+            return Response(
+                {"detail": "Supported fields: " + ", ".join(CephOSDBulkImporter.fields)},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if not request.user.has_perms(["netbox_osd.add_cephosd", "netbox_osd.change_cephosd"]):
+            raise PermissionDenied
+
+        importer = CephOSDBulkImporter(user=request.user, request_id=request.id)
+        try:
+            with transaction.atomic():
+                result = importer.upsert(
+                    records,
+                    partial=request.method == "PATCH",
+                    permitted=CephOSD.objects.restrict(request.user, "change"),
+                )
+
+                # Enforce object-level permissions on everything written
+                for action_name, objects in (("add", result["created"]), ("change", result["updated"])):
+                    permitted = CephOSD.objects.restrict(request.user, action_name).filter(
+                        pk__in=[obj.pk for obj in objects]
+                    )
+                    if permitted.count() != len(objects):
+                        raise PermissionDenied
+        except ValidationError as e:
+            return Response({"errors": e.messages}, status=status.HTTP_400_BAD_REQUEST)
+        except PermissionsViolation:
+            raise PermissionDenied
 
+        return Response({
+            "created": len(result["created"]),
+            "updated": len(result["updated"]),
+            "unchanged": len(result["unchanged"]),
+        })
 
-class CephOSDStatusNoteViewSet(NetBoxModelViewSet):
+    @action(detail=False, methods=["post"])
+    def transition(self, request):
+        """
+        Move every OSD matching the given filters (``id``, ``device``,
+        ``device_id``, ``rack_id``, ``cluster`` or ``cluster_id``) to
+        ``status`` in one transaction, recording ``reason`` as a status note on
+        each OSD that changed.
+        """
+        if not request.user.has_perms(["netbox_osd.change_cephosd", "netbox_osd.add_cephosdstatusnote"]):
+            raise PermissionDenied
+        serializer = CephOSDTransitionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+
+        filterset = CephOSDFilterSet(
+            {field: data[field] for field in serializer.filter_fields if data.get(field)},
+            queryset=CephOSD.objects.restrict(request.user, "change"),
+        )
+        if not filterset.is_valid():
+            return Response(filterset.errors, status=status.HTTP_400_BAD_REQUEST)
+
+        result = CephOSDTransition(user=request.user, request_id=request.id).run(
+            filterset.qs, data["status"], data["reason"]
+        )
+        return Response({
+            "updated": [osd.pk for osd in result["updated"]],
+            "unchanged": result["unchanged"],
+            "notes": len(result["notes"]),
+        })
+
+    @action(detail=True, methods=["get"])
+    def history(self, request, pk):
+        """
+        Return the OSD's status transitions between ``start`` and ``end``
+        (default: the last seven days), with the seconds spent in each status,
+        its availability and its flap count over the range.
+        """
+        osd = get_object_or_404(CephOSD.objects.restrict(request.user, "view"), pk=pk)
+        serializer = CephOSDHistoryRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        return Response({
+            "start": data["start"],
+            "end": data["end"],
+            **osd_history(osd, data["start"], data["end"]),
+        })
+
+    @action(detail=False, methods=["get"])
+    def availability(self, request):
+        """
+        Report time-in-state, availability and flap counts between ``start``
+        and ``end`` for the OSDs matching the list filters, grouped by
+        ``group_by`` (osd, device or cluster).
+        """
+        serializer = CephOSDHistoryRangeSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        osd_ids = self.filter_queryset(
+            CephOSD.objects.restrict(request.user, "view")
+        ).values_list("pk", flat=True)
+        return Response({
+            "start": data["start"],
+            "end": data["end"],
+            "group_by": data["group_by"],
+            "results": time_in_state(osd_ids, data["start"], data["end"], data["group_by"]),
+        })
+
+
+class CephOSDStatusNoteViewSet(ExportMixin, CursorPaginationMixin, NetBoxModelViewSet):
     queryset = CephOSDStatusNote.objects.prefetch_related("osd", "tags")
     serializer_class = CephOSDStatusNoteSerializer
     filterset_class = CephOSDStatusNoteFilterSet
+    export_filename = "ceph-osd-notes"
+    export_columns = (
+        ("id", "pk"),
+        ("osd", "osd__name"),
+        ("osd_id", "osd__osd_id"),
+        ("device", "osd__device__name"),
+        ("cluster", "osd__cluster__name"),
+        ("status", "status"),
+        ("reason", "reason"),
+        ("resolved", "resolved"),
+        ("resolved_at", "resolved_at"),
+        ("created", "created"),
+        ("last_updated", "last_updated"),
+    )
+    # Keyset orderings, backed by the primary key and netbox_osd_note_created
+    cursor_orderings = {"id": ("id",), "created": ("created", "id")}
+
+
+class CephMetricsView(APIView):
+    """
+    Prometheus metrics: OSD counts by cluster, site, status, type and
+    encryption, and open status note counts by cluster and status.  The
+    figures are shared by all callers and ignore object-level permission
+    constraints; only the view permission on OSDs is checked.
+    """
+    permission_classes = [IsAuthenticatedOrLoginNotRequired]
+    renderer_classes = [PrometheusRenderer]
+
+    def get_view_name(self):
+        return "Metrics"
+
+    def get(self, request):
+        if not request.user.has_perm("netbox_osd.view_cephosd"):
+            raise PermissionDenied
+        return Response(get_metrics(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -31,6 +31,16 @@ class OSDStatusChoices(ChoiceSet):
     ]
 
 
+# Compact codes under which CephOSDStatusTransition stores OSD statuses
+OSD_STATUS_CODES = {
+    OSDStatusChoices.ACTIVE: 1,
+    OSDStatusChoices.DOWN: 2,
+    OSDStatusChoices.OUT: 3,
+    OSDStatusChoices.DESTROYED: 4,
+}
+OSD_STATUS_CODE_CHOICES = [(code, status) for status, code in OSD_STATUS_CODES.items()]
+
+
 class NoteStatusChoices(ChoiceSet):
     """Status recorded on a status note — what state triggered the note."""
 
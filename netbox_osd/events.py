@@ -0,0 +1,7 @@
+from netbox.events import EVENT_TYPE_KIND_WARNING, EventType
+
+# Fired once per bulk status transition (see transitions.py), in place of an
+# object_updated event per OSD
+OSDS_TRANSITIONED = "netbox_osd.osds_transitioned"
+
+EventType(OSDS_TRANSITIONED, "Ceph OSDs transitioned", kind=EVENT_TYPE_KIND_WARNING).register()
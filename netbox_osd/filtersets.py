@@ -1,4 +1,5 @@
 import django_filters
+from django.db.models import Exists, OuterRef
 from netbox.filtersets import NetBoxModelFilterSet
 from dcim.models import Device, Rack, Site
 
@@ -60,14 +61,46 @@ class CephOSDFilterSet(NetBoxModelFilterSet):
     osd_type = django_filters.MultipleChoiceFilter(choices=OSDTypeChoices)
     status = django_filters.MultipleChoiceFilter(choices=OSDStatusChoices)
     encrypted = django_filters.BooleanFilter()
+    has_open_notes = django_filters.BooleanFilter(
+        method="filter_has_open_notes",
+        label="Has open notes",
+    )
+    open_notes = django_filters.NumberFilter(
+        field_name="open_note_count",
+        method="filter_open_notes",
+        label="Open notes",
+    )
+    open_notes__gte = django_filters.NumberFilter(
+        field_name="open_note_count__gte",
+        method="filter_open_notes",
+        label="Open notes (at least)",
+    )
+    open_notes__lte = django_filters.NumberFilter(
+        field_name="open_note_count__lte",
+        method="filter_open_notes",
+        label="Open notes (at most)",
+    )
 
     class Meta:
         model = CephOSD
-        fields = ["name", "osd_type", "status", "encrypted"]
+        # osd_id also gets the standard numeric lookups (osd_id__gte, osd_id__lte, ...)
+        fields = ["name", "osd_id", "osd_type", "status", "encrypted"]
 
     def search(self, queryset, name, value):
         return queryset.filter(name__icontains=value)
 
+    def filter_has_open_notes(self, queryset, name, value):
+        if value is None:
+            return queryset
+        open_notes = CephOSDStatusNote.objects.filter(osd=OuterRef("pk"), resolved=False)
+        if value:
+            return queryset.filter(Exists(open_notes))
+        return queryset.exclude(Exists(open_notes))
+
+    def filter_open_notes(self, queryset, name, value):
+        # `name` carries the annotation lookup, e.g. open_note_count__gte
+        return queryset.with_open_note_count().filter(**{name: value})
+
 
 class CephOSDStatusNoteFilterSet(NetBoxModelFilterSet):
     osd_id = django_filters.ModelMultipleChoiceFilter(
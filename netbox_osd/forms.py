@@ -63,6 +63,7 @@ class CephOSDForm(NetBoxModelForm):
 
     fieldsets = (
         FieldSet("cluster", "name", "device", "osd_type", "encrypted", "status", name="OSD"),
+        FieldSet("size_bytes", "used_bytes", "crush_weight", "reweight", name="Capacity"),
         FieldSet("description", name="Notes"),
         FieldSet("tags", name="Tags"),
     )
@@ -76,6 +77,10 @@ class CephOSDForm(NetBoxModelForm):
             "osd_type",
             "encrypted",
             "status",
+            "size_bytes",
+            "used_bytes",
+            "crush_weight",
+            "reweight",
             "description",
             "tags",
         ]
@@ -101,6 +106,10 @@ class CephOSDBulkEditForm(NetBoxModelBulkEditForm):
         required=False,
         widget=forms.NullBooleanSelect(),
     )
+    reason = forms.CharField(
+        required=False,
+        help_text="When only the status is changed, recorded as a status note on every OSD",
+    )
 
     nullable_fields = ("cluster",)
 
@@ -137,7 +146,22 @@ class CephOSDFilterForm(NetBoxModelFilterSetForm):
         choices=OSDStatusChoices,
         required=False,
     )
+    osd_id = forms.IntegerField(
+        required=False,
+        min_value=0,
+        label="OSD ID",
+    )
     encrypted = forms.NullBooleanField(required=False, widget=forms.NullBooleanSelect())
+    has_open_notes = forms.NullBooleanField(
+        required=False,
+        widget=forms.NullBooleanSelect(),
+        label="Has open notes",
+    )
+    open_notes__gte = forms.IntegerField(
+        required=False,
+        min_value=0,
+        label="Open notes (at least)",
+    )
     tag = TagFilterField(model)
 
 
@@ -234,13 +258,15 @@ class CephClusterImportForm(NetBoxModelImportForm):
 
 class CephOSDImportForm(NetBoxModelImportForm):
     """
-    CSV columns: name, cluster, device, osd_type, encrypted, status, description
+    CSV columns: name, cluster, device, osd_type, encrypted, status,
+    size_bytes, used_bytes, crush_weight, reweight, description
 
     - cluster : exact cluster name (optional)
     - device  : exact device name in NetBox
     - osd_type: hdd | ssd | nvme
     - encrypted: true | false
     - status  : active | down | out | destroyed
+    - size_bytes, used_bytes, crush_weight, reweight: optional
 
     Example:
         name,cluster,device,osd_type,encrypted,status,description
@@ -271,7 +297,19 @@ class CephOSDImportForm(NetBoxModelImportForm):
 
     class Meta:
         model = CephOSD
-        fields = ["cluster", "name", "device", "osd_type", "encrypted", "status", "description"]
+        fields = [
+            "cluster",
+            "name",
+            "device",
+            "osd_type",
+            "encrypted",
+            "status",
+            "size_bytes",
+            "used_bytes",
+            "crush_weight",
+            "reweight",
+            "description",
+        ]
 
 
 class CephOSDStatusNoteImportForm(NetBoxModelImportForm):
@@ -290,9 +328,7 @@ class CephOSDStatusNoteImportForm(NetBoxModelImportForm):
         storage-02,osd.3,out,Drive permanently failed replaced,true
     """
 
-    osd_device = CSVModelChoiceField(
-        queryset=Device.objects.all(),
-        to_field_name="name",
+    osd_device = forms.CharField(
         help_text="Device name the OSD lives on",
     )
     osd_name = forms.CharField(
@@ -307,17 +343,27 @@ class CephOSDStatusNoteImportForm(NetBoxModelImportForm):
         model = CephOSDStatusNote
         fields = ["osd_device", "osd_name", "status", "reason", "resolved"]
 
+    def __init__(self, *args, osd_map=None, **kwargs):
+        # Optional {(device name, OSD name): CephOSD} map pre-resolved for the
+        # whole upload by CephOSDStatusNoteImportView; without it each row is
+        # looked up individually.
+        self.osd_map = osd_map
+        super().__init__(*args, **kwargs)
+
     def clean(self):
         cleaned = super().clean()
-        device = cleaned.get("osd_device")
+        device_name = cleaned.get("osd_device")
         osd_name = cleaned.get("osd_name")
-        if device and osd_name:
-            try:
-                cleaned["osd"] = CephOSD.objects.get(device=device, name=osd_name)
-            except CephOSD.DoesNotExist:
+        if device_name and osd_name:
+            if self.osd_map is not None:
+                osd = self.osd_map.get((device_name, osd_name))
+            else:
+                osd = CephOSD.objects.filter(device__name=device_name, name=osd_name).first()
+            if osd is None:
                 raise forms.ValidationError(
-                    f"No OSD named '{osd_name}' found on device '{device}'"
+                    f"No OSD named '{osd_name}' found on device '{device_name}'"
                 )
+            cleaned["osd"] = osd
         return cleaned
 
     def save(self, commit=True):
@@ -0,0 +1,28 @@
+import strawberry_django
+from netbox.graphql.filter_mixins import BaseFilterMixin, autotype_decorator
+
+from .. import filtersets, models
+
+__all__ = (
+    "CephClusterFilter",
+    "CephOSDFilter",
+    "CephOSDStatusNoteFilter",
+)
+
+
+@strawberry_django.filter(models.CephCluster, lookups=True)
+@autotype_decorator(filtersets.CephClusterFilterSet)
+class CephClusterFilter(BaseFilterMixin):
+    pass
+
+
+@strawberry_django.filter(models.CephOSD, lookups=True)
+@autotype_decorator(filtersets.CephOSDFilterSet)
+class CephOSDFilter(BaseFilterMixin):
+    pass
+
+
+@strawberry_django.filter(models.CephOSDStatusNote, lookups=True)
+@autotype_decorator(filtersets.CephOSDStatusNoteFilterSet)
+class CephOSDStatusNoteFilter(BaseFilterMixin):
+    pass
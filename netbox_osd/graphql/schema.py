@@ -0,0 +1,21 @@
+from typing import List
+
+import strawberry
+import strawberry_django
+
+from .types import CephClusterType, CephOSDStatusNoteType, CephOSDType
+
+
+@strawberry.type(name="Query")
+class NetBoxOSDQuery:
+    ceph_cluster: CephClusterType = strawberry_django.field()
+    ceph_cluster_list: List[CephClusterType] = strawberry_django.field()
+
+    ceph_osd: CephOSDType = strawberry_django.field()
+    ceph_osd_list: List[CephOSDType] = strawberry_django.field()
+
+    ceph_osd_status_note: CephOSDStatusNoteType = strawberry_django.field()
+    ceph_osd_status_note_list: List[CephOSDStatusNoteType] = strawberry_django.field()
+
+
+schema = [NetBoxOSDQuery]
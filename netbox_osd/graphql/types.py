@@ -0,0 +1,38 @@
+from typing import Annotated, List
+
+import strawberry
+import strawberry_django
+from netbox.graphql.types import NetBoxObjectType
+
+from .. import models
+from .filters import CephClusterFilter, CephOSDFilter, CephOSDStatusNoteFilter
+
+__all__ = (
+    "CephClusterType",
+    "CephOSDType",
+    "CephOSDStatusNoteType",
+)
+
+# Relations, including the reverse lists, are declared as model fields so that
+# NetBox's query optimizer resolves each nesting level with one prefetch query
+# rather than one query per parent object.
+
+
+@strawberry_django.type(models.CephCluster, fields="__all__", filters=CephClusterFilter)
+class CephClusterType(NetBoxObjectType):
+    site: Annotated["SiteType", strawberry.lazy("dcim.graphql.types")] | None
+
+    osds: List[Annotated["CephOSDType", strawberry.lazy("netbox_osd.graphql.types")]]
+
+
+@strawberry_django.type(models.CephOSD, fields="__all__", filters=CephOSDFilter)
+class CephOSDType(NetBoxObjectType):
+    cluster: Annotated["CephClusterType", strawberry.lazy("netbox_osd.graphql.types")] | None
+    device: Annotated["DeviceType", strawberry.lazy("dcim.graphql.types")] | None
+
+    status_notes: List[Annotated["CephOSDStatusNoteType", strawberry.lazy("netbox_osd.graphql.types")]]
+
+
+@strawberry_django.type(models.CephOSDStatusNote, fields="__all__", filters=CephOSDStatusNoteFilter)
+class CephOSDStatusNoteType(NetBoxObjectType):
+    osd: Annotated["CephOSDType", strawberry.lazy("netbox_osd.graphql.types")]
@@ -0,0 +1,148 @@
+"""
+OSD status history: recording CephOSDStatusTransition rows and reporting
+time-in-state and flap counts from them.
+
+Single-object saves are recorded by the post_save receiver in signals.py;
+bulk write paths, which send no signals, call record_transitions()
+directly.  Reports are computed in one SQL statement per request: a
+``LEAD()`` window over each OSD's transitions turns them into intervals,
+which are clipped to the requested range and summed per group.
+"""
+from django.db import connection
+
+from .choices import OSD_STATUS_CODES, OSDStatusChoices
+from .models import CephOSD, CephOSDStatusTransition
+
+# Reverse of OSD_STATUS_CODES
+OSD_STATUSES = {code: status for status, code in OSD_STATUS_CODES.items()}
+
+# Report groupings: name -> grouping column on the cephosd table
+GROUPINGS = {
+    "osd": "id",
+    "device": "device_id",
+    "cluster": "cluster_id",
+}
+
+TIME_IN_STATE_SQL = """
+WITH scoped AS (
+    SELECT t.osd_id,
+           t.from_status,
+           t.to_status,
+           t.ts,
+           LEAD(t.ts) OVER (PARTITION BY t.osd_id ORDER BY t.ts, t.id) AS next_ts
+    FROM {transitions} t
+    WHERE t.osd_id = ANY(%(osd_ids)s)
+      AND t.ts < %(end)s
+      -- Start from the last transition at or before the range, which gives
+      -- each OSD's status when the range opens
+      AND t.ts >= COALESCE(
+          (SELECT MAX(p.ts) FROM {transitions} p WHERE p.osd_id = t.osd_id AND p.ts <= %(start)s),
+          %(start)s
+      )
+),
+intervals AS (
+    SELECT osd_id,
+           from_status,
+           to_status,
+           ts,
+           GREATEST(
+               LEAST(COALESCE(next_ts, %(end)s), %(end)s) - GREATEST(ts, %(start)s),
+               INTERVAL '0'
+           ) AS duration
+    FROM scoped
+)
+SELECT o.{group_column} AS group_id,
+       {status_columns},
+       COUNT(*) FILTER (WHERE i.from_status = %(active)s AND i.ts >= %(start)s) AS flaps
+FROM intervals i
+JOIN {osds} o ON o.id = i.osd_id
+GROUP BY o.{group_column}
+ORDER BY o.{group_column}
+"""
+
+
+def record_transitions(changes, ts):
+    """
+    Record a batch of status changes, given as ``(osd_pk, from_status,
+    to_status)`` tuples of OSDStatusChoices values, at timestamp `ts`.
+    ``from_status`` is None for a newly created OSD.  Entries whose status
+    did not change are skipped.
+    """
+    transitions = [
+        CephOSDStatusTransition(
+            osd_id=osd_pk,
+            from_status=OSD_STATUS_CODES.get(from_status),
+            to_status=OSD_STATUS_CODES[to_status],
+            ts=ts,
+        )
+        for osd_pk, from_status, to_status in changes
+        if from_status != to_status
+    ]
+    return CephOSDStatusTransition.objects.bulk_create(transitions, batch_size=1000)
+
+
+def time_in_state(osd_ids, start, end, group_by="osd"):
+    """
+    Return the seconds spent in each status and the number of flaps
+    (transitions out of ``active``) between `start` and `end`, for the OSDs
+    in `osd_ids` grouped by OSD, device or cluster.  Each row is a dict with
+    ``id``, ``seconds`` (a status -> seconds map), ``availability`` (the
+    fraction of tracked time spent active) and ``flaps``.
+    """
+    group_column = GROUPINGS[group_by]
+    sql = TIME_IN_STATE_SQL.format(
+        transitions=CephOSDStatusTransition._meta.db_table,
+        osds=CephOSD._meta.db_table,
+        group_column=group_column,
+        status_columns=",\n       ".join(
+            f'COALESCE(EXTRACT(EPOCH FROM SUM(i.duration) FILTER (WHERE i.to_status = {code})), 0) AS "{status}"'
+            for status, code in OSD_STATUS_CODES.items()
+        ),
+    )
+    params = {
+        "osd_ids": list(osd_ids),
+        "start": start,
+        "end": end,
+        "active": OSD_STATUS_CODES[OSDStatusChoices.ACTIVE],
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    results = []
+    for group_id, *seconds, flaps in rows:
+        seconds = dict(zip(OSD_STATUS_CODES, (float(value) for value in seconds)))
+        tracked = sum(seconds.values())
+        results.append({
+            "id": group_id,
+            "seconds": seconds,
+            "availability": round(seconds[OSDStatusChoices.ACTIVE] / tracked, 6) if tracked else None,
+            "flaps": flaps,
+        })
+    return results
+
+
+def osd_history(osd, start, end):
+    """
+    Return `osd`'s transitions between `start` and `end`, preceded by the
+    transition which set its status at `start`, along with its time-in-state
+    over the range.
+    """
+    transitions = CephOSDStatusTransition.objects.filter(osd=osd)
+    opening = transitions.filter(ts__lte=start).order_by("-ts", "-id").first()
+    in_range = list(transitions.filter(ts__gt=start, ts__lt=end).order_by("ts", "id"))
+    if opening:
+        in_range.insert(0, opening)
+
+    stats = time_in_state([osd.pk], start, end)
+    return {
+        "transitions": [
+            {
+                "from_status": OSD_STATUSES.get(transition.from_status),
+                "to_status": OSD_STATUSES[transition.to_status],
+                "ts": transition.ts,
+            }
+            for transition in in_range
+        ],
+        **(stats[0] if stats else {"id": osd.pk, "seconds": {}, "availability": None, "flaps": 0}),
+    }
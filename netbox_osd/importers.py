@@ -0,0 +1,536 @@
+import uuid
+from decimal import Decimal, InvalidOperation
+
+from core.choices import ObjectChangeActionChoices
+from core.models import ObjectChange, ObjectType
+from dcim.models import Device
+from django.core.exceptions import ValidationError
+from django.db.models import prefetch_related_objects
+from django.utils.functional import cached_property
+from django.utils.timezone import now
+from extras.models import CachedValue, CustomField, Tag
+from netbox.search.backends import search_backend
+from netbox.signals import post_clean
+from utilities.exceptions import PermissionsViolation
+
+from .choices import OSDStatusChoices, OSDTypeChoices
+from .history import record_transitions
+from .models import OSD_ID_MAX, CephCluster, CephOSD, parse_osd_id
+from .summary import invalidate_summaries
+
+TRUE_VALUES = {"true", "t", "yes", "y", "1"}
+FALSE_VALUES = {"false", "f", "no", "n", "0", ""}
+
+
+def parse_bool(value):
+    if isinstance(value, bool):
+        return value
+    value = str(value).strip().lower()
+    if value in TRUE_VALUES:
+        return True
+    if value in FALSE_VALUES:
+        return False
+    raise ValueError(f"Invalid boolean value: {value}")
+
+
+def cache_search_values(objects, replace=False):
+    """
+    Add objects written in bulk to NetBox's search cache; bulk writes bypass
+    the post_save handler that normally does this.  With ``replace``, the
+    objects' existing cached values are removed first in a single query.
+    """
+    if not objects:
+        return
+    if replace:
+        object_type = ObjectType.objects.get_for_model(objects[0])
+        CachedValue.objects.filter(object_type=object_type, object_id__in=[obj.pk for obj in objects]).delete()
+    search_backend.cache(objects, remove_existing=False)
+
+
+def resolve_by_name(model, values):
+    """
+    Resolve a set of object references for the given model with at most two
+    queries: strings are matched by name, integers by primary key.  Returns a
+    ``{value: object}`` map in which ambiguous names map to ``None``.
+    """
+    names = {v for v in values if isinstance(v, str)}
+    pks = {v for v in values if isinstance(v, int)}
+    resolved = {}
+    if names:
+        for obj in model.objects.filter(name__in=names):
+            resolved[obj.name] = None if obj.name in resolved else obj
+    if pks:
+        resolved.update(model.objects.in_bulk(pks))
+    return resolved
+
+
+class CephOSDBulkImporter:
+    """
+    Import large batches of CephOSD records.
+
+    Every device and cluster referenced by the batch is resolved up front
+    with one query each, all rows are validated in memory, and objects are
+    then written in chunks with ``bulk_create``/``bulk_update``.  One
+    ObjectChange is still recorded per object, also written in bulk.
+
+    Records are dicts keyed by the CSV column names of CephOSDImportForm;
+    ``device`` and ``cluster`` may be given as names or primary keys.
+
+    In place of per-object full_clean(), records are validated by
+    clean_record(), check_osd_ids() and NetBox's CUSTOM_VALIDATORS (run
+    through post_clean, as full_clean() does).  New OSDs get their custom
+    field defaults; they cannot be created while a required custom field
+    has no default.  No save signals are sent, so object_created and
+    object_updated event rules and webhooks do not fire for OSDs written
+    here.
+    """
+
+    fields = (
+        "cluster",
+        "name",
+        "device",
+        "osd_type",
+        "encrypted",
+        "status",
+        "size_bytes",
+        "used_bytes",
+        "crush_weight",
+        "reweight",
+        "description",
+    )
+    # Fields rendered into the search cache by search.CephOSDIndex
+    search_fields = {"name", "device", "cluster", "description"}
+    defaults = {
+        "cluster": None,
+        "osd_type": OSDTypeChoices.HDD,
+        "encrypted": False,
+        "status": OSDStatusChoices.ACTIVE,
+        "size_bytes": None,
+        "used_bytes": None,
+        "crush_weight": None,
+        "reweight": None,
+        "description": "",
+    }
+    # Decimal places of CephOSD.crush_weight and CephOSD.reweight
+    weight_precision = Decimal("0.00001")
+    # Column limits which bulk_create() would otherwise only hit in the database
+    name_max_length = CephOSD._meta.get_field("name").max_length
+    bytes_max = 9223372036854775807
+
+    def __init__(self, user=None, request_id=None, chunk_size=500):
+        self.user = user
+        self.request_id = request_id or uuid.uuid4()
+        self.chunk_size = chunk_size
+
+    @cached_property
+    def custom_field_defaults(self):
+        return {cf.name: cf.default for cf in CustomField.objects.get_for_model(CephOSD)}
+
+    @staticmethod
+    def required_custom_fields():
+        """
+        Return the names of required custom fields without a default, which
+        the importer cannot fill in for new OSDs.
+        """
+        return [
+            cf.name for cf in CustomField.objects.get_for_model(CephOSD)
+            if cf.required and cf.default is None
+        ]
+
+    @classmethod
+    def supports(cls, records):
+        """
+        Return True if every record uses only columns the importer handles.
+        Uploads carrying other columns (id, tags, custom fields) must go through
+        the regular per-row import form.
+        """
+        return all(set(record).issubset(cls.fields) for record in records)
+
+    def create(self, records, start=1):
+        """
+        Validate and create CephOSDs for all records.  Raises ValidationError
+        listing every invalid row; nothing is written in that case.  `start`
+        is the number of the first record in error messages.
+        """
+        rows = self.validate(records, start=start)
+
+        existing = self.get_existing(rows)
+        if errors := [
+            f"Record {i}: OSD '{attrs['name']}' already exists on device '{attrs['device']}'"
+            for i, attrs in enumerate(rows, start=start)
+            if (attrs["device"].pk, attrs["name"]) in existing
+        ]:
+            raise ValidationError(errors)
+        self.check_osd_ids([
+            (i, attrs["cluster"].pk if attrs.get("cluster") else None, attrs["osd_id"], None)
+            for i, attrs in enumerate(rows, start=start)
+        ])
+
+        return self.write_new([self.new_osd(attrs) for attrs in rows])
+
+    def upsert(self, records, partial=False, start=1, permitted=None, match_osd_id=False):
+        """
+        Create or update CephOSDs keyed on (device, name).  Existing OSDs are
+        fetched with one query and only rows whose fields actually differ are
+        written.  With ``partial``, fields absent from a record are left
+        untouched on existing OSDs; otherwise they are reset to their defaults.
+        If `permitted` is given, it is a queryset of the OSDs the caller may
+        change (e.g. ``CephOSD.objects.restrict(user, "change")``); a change
+        to any other OSD raises PermissionsViolation before anything is
+        written.
+
+        With ``match_osd_id``, records (which must then name their cluster)
+        are matched first on (cluster, OSD ID), so an OSD which moved to
+        another host is updated in place rather than created again; records
+        with no such OSD fall back to (device, name).
+
+        Returns a dict of ``created``, ``updated`` and ``unchanged`` objects.
+        """
+        rows = self.validate(records, partial=partial, start=start)
+        existing = self.get_existing(rows)
+        existing_ids = self.get_existing_osd_ids(rows) if match_osd_id else {}
+
+        new_objects = []
+        changed = {}
+        unchanged = []
+        osd_ids = []
+        errors = []
+        for i, attrs in enumerate(rows, start=start):
+            osd = existing.get((attrs["device"].pk, attrs["name"]))
+            if match_osd_id and (moved := existing_ids.get((attrs["cluster"].pk, attrs["osd_id"]))):
+                if osd is not None and osd.pk != moved.pk:
+                    errors.append(
+                        f"Record {i}: cannot move OSD ID {attrs['osd_id']} to device '{attrs['device']}', "
+                        f"which already has an OSD named '{attrs['name']}'"
+                    )
+                    continue
+                osd = moved
+            if osd is None:
+                attrs = {**self.defaults, **attrs}
+                new_objects.append(self.new_osd(attrs))
+                cluster_id = attrs["cluster"].pk if attrs["cluster"] else None
+                osd_ids.append((i, cluster_id, attrs["osd_id"], None))
+                continue
+            if osd.device_id == attrs["device"].pk:
+                # Reuse the resolved device rather than fetching it per OSD
+                osd.device = attrs["device"]
+            if not partial:
+                attrs = {**self.defaults, **attrs}
+            if diff := self.diff(osd, attrs):
+                changed[osd] = diff
+            else:
+                unchanged.append(osd)
+            if "cluster" in attrs:
+                cluster_id = attrs["cluster"].pk if attrs["cluster"] else None
+            else:
+                cluster_id = osd.cluster_id
+            osd_ids.append((i, cluster_id, attrs["osd_id"], osd.pk))
+        if errors:
+            raise ValidationError(errors)
+        self.check_osd_ids(osd_ids)
+        if permitted is not None:
+            self.check_permitted(changed, permitted)
+
+        return {
+            "created": self.write_new(new_objects),
+            "updated": self.write_changes(changed),
+            "unchanged": unchanged,
+        }
+
+    def new_osd(self, attrs):
+        return CephOSD(**{**self.defaults, **attrs}, custom_field_data=dict(self.custom_field_defaults))
+
+    def validate(self, records, partial=False, start=1):
+        """
+        Clean every record into a dict of model attributes, raising
+        ValidationError with one message per problem found.
+        """
+        devices = resolve_by_name(Device, {r["device"] for r in records if r.get("device")})
+        clusters = resolve_by_name(CephCluster, {r["cluster"] for r in records if r.get("cluster")})
+
+        rows = []
+        errors = []
+        seen = set()
+        for i, record in enumerate(records, start=start):
+            try:
+                attrs = self.clean_record(record, devices, clusters, partial=partial)
+            except ValidationError as e:
+                errors.extend(f"Record {i}: {message}" for message in e.messages)
+                continue
+
+            key = (attrs["device"].pk, attrs["name"])
+            if key in seen:
+                errors.append(
+                    f"Record {i}: duplicate OSD '{attrs['name']}' on device '{attrs['device']}' in this import"
+                )
+            seen.add(key)
+            rows.append(attrs)
+
+        if errors:
+            raise ValidationError(errors)
+        return rows
+
+    def clean_record(self, record, devices, clusters, partial=False):
+        """
+        Return the model attributes for a single record.  With ``partial``,
+        only the columns present in the record (plus the natural key) are
+        returned.
+        """
+        attrs = {}
+        errors = []
+
+        if not (name := str(record.get("name") or "").strip()):
+            errors.append("name is required")
+        elif len(name) > self.name_max_length:
+            errors.append(f"name is longer than {self.name_max_length} characters")
+        elif (osd_id := parse_osd_id(name)) is None:
+            errors.append(f"invalid OSD name '{name}' (expected osd.<id> with an ID up to {OSD_ID_MAX})")
+        else:
+            attrs["osd_id"] = osd_id
+        attrs["name"] = name
+
+        if not record.get("device"):
+            errors.append("device is required")
+        elif (device := devices.get(record["device"])) is None:
+            if record["device"] in devices:
+                errors.append(f"device '{record['device']}' matches more than one device")
+            else:
+                errors.append(f"device '{record['device']}' not found")
+        else:
+            attrs["device"] = device
+
+        if "cluster" in record or not partial:
+            attrs["cluster"] = None
+            if record.get("cluster"):
+                if (cluster := clusters.get(record["cluster"])) is None:
+                    errors.append(f"cluster '{record['cluster']}' not found")
+                attrs["cluster"] = cluster
+
+        if "osd_type" in record or not partial:
+            attrs["osd_type"] = record.get("osd_type") or self.defaults["osd_type"]
+            if attrs["osd_type"] not in OSDTypeChoices.values():
+                errors.append(f"invalid osd_type '{attrs['osd_type']}'")
+
+        if "status" in record or not partial:
+            attrs["status"] = record.get("status") or self.defaults["status"]
+            if attrs["status"] not in OSDStatusChoices.values():
+                errors.append(f"invalid status '{attrs['status']}'")
+
+        if "encrypted" in record or not partial:
+            try:
+                attrs["encrypted"] = parse_bool(record.get("encrypted", False))
+            except ValueError as e:
+                errors.append(str(e))
+
+        for field in ("size_bytes", "used_bytes"):
+            if field in record or not partial:
+                attrs[field] = None
+                if (value := record.get(field)) not in (None, ""):
+                    try:
+                        attrs[field] = int(value)
+                    except (TypeError, ValueError):
+                        errors.append(f"invalid {field} '{value}'")
+                        continue
+                    if attrs[field] < 0:
+                        errors.append(f"{field} cannot be negative")
+                    elif attrs[field] > self.bytes_max:
+                        errors.append(f"{field} out of range")
+        if (attrs.get("used_bytes") or 0) > (attrs.get("size_bytes") or float("inf")):
+            errors.append("used_bytes cannot exceed size_bytes")
+
+        for field, max_value in (("crush_weight", Decimal("99999.99999")), ("reweight", 1)):
+            if field in record or not partial:
+                attrs[field] = None
+                if (value := record.get(field)) not in (None, ""):
+                    try:
+                        attrs[field] = Decimal(str(value)).quantize(self.weight_precision)
+                    except InvalidOperation:
+                        errors.append(f"invalid {field} '{value}'")
+                        continue
+                    if not 0 <= attrs[field] <= max_value:
+                        errors.append(f"{field} out of range")
+
+        if "description" in record or not partial:
+            attrs["description"] = record.get("description") or ""
+
+        if errors:
+            raise ValidationError(errors)
+        return attrs
+
+    def get_existing(self, rows):
+        """
+        Return a ``{(device ID, name): CephOSD}`` map of the OSDs already
+        matching the natural keys of `rows`, fetched with one query.
+        """
+        keys = {(attrs["device"].pk, attrs["name"]) for attrs in rows}
+        if not keys:
+            return {}
+        queryset = CephOSD.objects.filter(
+            device__in={device_id for device_id, _ in keys},
+            name__in={name for _, name in keys},
+        )
+        return {
+            (osd.device_id, osd.name): osd
+            for osd in queryset
+            if (osd.device_id, osd.name) in keys
+        }
+
+    def get_existing_osd_ids(self, rows):
+        """
+        Return a ``{(cluster ID, OSD ID): CephOSD}`` map of the OSDs already
+        holding the OSD IDs of `rows` within their clusters, fetched with one
+        query.
+        """
+        keys = {(attrs["cluster"].pk, attrs["osd_id"]) for attrs in rows if attrs.get("cluster")}
+        if not keys:
+            return {}
+        queryset = CephOSD.objects.filter(
+            cluster__in={cluster_id for cluster_id, _ in keys},
+            osd_id__in={osd_id for _, osd_id in keys},
+        )
+        return {
+            (osd.cluster_id, osd.osd_id): osd
+            for osd in queryset
+            if (osd.cluster_id, osd.osd_id) in keys
+        }
+
+    @staticmethod
+    def check_permitted(osds, permitted):
+        """
+        Raise PermissionsViolation unless every one of `osds` is in the
+        `permitted` queryset.
+        """
+        pks = [osd.pk for osd in osds]
+        if pks and permitted.filter(pk__in=pks).count() != len(pks):
+            raise PermissionsViolation
+
+    @staticmethod
+    def check_osd_ids(rows):
+        """
+        Ensure no two OSDs would end up sharing an OSD ID within a cluster.
+        `rows` holds (record number, cluster ID, OSD ID, existing OSD pk or
+        None) for the final state of every imported OSD.
+        """
+        claimed = {}
+        errors = []
+        for i, cluster_id, osd_id, pk in rows:
+            if cluster_id is None:
+                continue
+            if (cluster_id, osd_id) in claimed:
+                errors.append(f"Record {i}: duplicate OSD ID {osd_id} within a cluster in this import")
+            claimed[(cluster_id, osd_id)] = (i, pk)
+
+        if claimed:
+            taken = CephOSD.objects.filter(
+                cluster__in={cluster_id for cluster_id, _ in claimed},
+                osd_id__in={osd_id for _, osd_id in claimed},
+            ).values_list("cluster_id", "osd_id", "pk")
+            for cluster_id, osd_id, pk in taken:
+                if (claim := claimed.get((cluster_id, osd_id))) and claim[1] != pk:
+                    errors.append(f"Record {claim[0]}: OSD ID {osd_id} is already used in this cluster")
+
+        if errors:
+            raise ValidationError(errors)
+
+    @staticmethod
+    def diff(osd, attrs):
+        """
+        Return the {field: value} pairs in `attrs` which differ from `osd`.
+        """
+        changed = {}
+        for field, value in attrs.items():
+            if field in ("cluster", "device"):
+                current = getattr(osd, f"{field}_id")
+                if current != (value.pk if value else None):
+                    changed[field] = value
+            elif getattr(osd, field) != value:
+                changed[field] = value
+        return changed
+
+    @staticmethod
+    def run_custom_validators(objects):
+        """
+        Apply NetBox's CUSTOM_VALIDATORS to `objects` by sending post_clean,
+        as full_clean() would, raising ValidationError with every failure.
+        """
+        errors = []
+        for obj in objects:
+            try:
+                post_clean.send(sender=CephOSD, instance=obj)
+            except ValidationError as e:
+                errors.extend(f"{obj}: {message}" for message in e.messages)
+        if errors:
+            raise ValidationError(errors)
+
+    def write_new(self, objects):
+        if objects and (required := self.required_custom_fields()):
+            raise ValidationError(
+                f"Cannot create OSDs in bulk while the required custom fields {', '.join(required)} have no "
+                f"default; import them through the regular import instead"
+            )
+        self.run_custom_validators(objects)
+        created = []
+        for start in range(0, len(objects), self.chunk_size):
+            chunk = CephOSD.objects.bulk_create(objects[start:start + self.chunk_size])
+            for obj in chunk:
+                # Objects written in bulk carry no tags yet; prime the prefetch
+                # cache so serialization doesn't query for them one at a time.
+                obj._prefetched_objects_cache = {"tags": Tag.objects.none()}
+            self.log_changes(chunk, ObjectChangeActionChoices.ACTION_CREATE)
+            cache_search_values(chunk)
+            # bulk_create() sends no post_save, so record the initial statuses
+            # and drop cached cluster summaries here
+            record_transitions([(obj.pk, None, obj.status) for obj in chunk], now())
+            invalidate_summaries({obj.cluster_id for obj in chunk})
+            created.extend(chunk)
+        return created
+
+    def write_changes(self, changed):
+        """
+        Apply a ``{CephOSD: {field: value}}`` map of changes with bulk_update.
+        """
+        objects = list(changed)
+        updated = []
+        for start in range(0, len(objects), self.chunk_size):
+            chunk = objects[start:start + self.chunk_size]
+            prefetch_related_objects(chunk, "tags")
+            fields = {"last_updated"}
+            timestamp = now()
+            for osd in chunk:
+                osd.snapshot()
+                for field, value in changed[osd].items():
+                    setattr(osd, field, value)
+                fields.update(changed[osd])
+                osd.last_updated = timestamp
+            self.run_custom_validators(chunk)
+            CephOSD.objects.bulk_update(chunk, fields)
+            self.log_changes(chunk, ObjectChangeActionChoices.ACTION_UPDATE)
+            record_transitions(
+                [
+                    (osd.pk, osd._prechange_snapshot.get("status"), osd.status)
+                    for osd in chunk if "status" in changed[osd]
+                ],
+                timestamp,
+            )
+            cache_search_values(
+                [osd for osd in chunk if changed[osd].keys() & self.search_fields],
+                replace=True,
+            )
+            invalidate_summaries(
+                {osd.cluster_id for osd in chunk} | {osd._prechange_snapshot.get("cluster") for osd in chunk}
+            )
+            updated.extend(chunk)
+        return updated
+
+    def log_changes(self, objects, action):
+        """
+        Record one ObjectChange per object with a single bulk insert.
+        """
+        changes = []
+        for obj in objects:
+            change = obj.to_objectchange(action)
+            change.user = self.user
+            change.user_name = getattr(self.user, "username", "")
+            change.request_id = self.request_id
+            changes.append(change)
+        ObjectChange.objects.bulk_create(changes, batch_size=self.chunk_size)
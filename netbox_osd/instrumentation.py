@@ -0,0 +1,231 @@
+"""
+Opt-in query and latency instrumentation, enabled with the ``instrument``
+plugin setting.
+
+While enabled, InstrumentationMiddleware measures every request to a plugin
+view or API endpoint, and ``instrumented()`` measures template extensions
+rendered into core pages (DeviceCephOSDPanel).  Each measurement records the
+number of SQL queries, the time spent in the database, the time spent
+rendering templates and responses, and the wall-clock time of the scope.
+A request's measurements are returned in a ``Server-Timing`` header plus
+``X-NetBox-OSD-Queries``, and logged as one line per scope to the
+``netbox_osd.instrumentation`` logger.
+
+Django has no hook around template rendering, so while the setting is on
+(and only then) install_template_timing() wraps
+``django.template.base.Template.render`` for the whole process.  The wrapper
+only adds timing while a scope is open.  With the setting off the middleware
+is never installed and Django is left untouched.
+"""
+import functools
+import logging
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.base import Template
+from django.urls import Resolver404, resolve
+from netbox.plugins import get_plugin_config
+
+logger = logging.getLogger("netbox_osd.instrumentation")
+
+# URL namespaces of the plugin's UI views and API endpoints
+NAMESPACES = {"netbox_osd", "netbox_osd-api"}
+
+# Measurements open in the current context, innermost last
+_active = ContextVar("netbox_osd_instrumentation_active", default=())
+# Measurements completed during the current request
+_completed = ContextVar("netbox_osd_instrumentation_completed", default=None)
+
+
+class Measurement:
+    __slots__ = ("name", "queries", "db_time", "render_time", "duration", "rendering")
+
+    def __init__(self, name):
+        self.name = name
+        self.queries = 0
+        self.db_time = 0.0
+        self.render_time = 0.0
+        self.duration = 0.0
+        # Set while an enclosing rendering() block is timing this scope
+        self.rendering = False
+
+    def as_dict(self):
+        return {
+            "scope": self.name,
+            "queries": self.queries,
+            "db_ms": round(self.db_time * 1000, 1),
+            "render_ms": round(self.render_time * 1000, 1),
+            "duration_ms": round(self.duration * 1000, 1),
+        }
+
+
+def _count_query(execute, sql, params, many, context):
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        elapsed = time.perf_counter() - start
+        for measurement in _active.get():
+            measurement.queries += 1
+            measurement.db_time += elapsed
+
+
+def is_enabled():
+    return bool(get_plugin_config("netbox_osd", "instrument"))
+
+
+@contextmanager
+def measure(name):
+    """
+    Measure the enclosed block as scope `name`.  Queries are counted on every
+    database connection; nested scopes count toward each enclosing scope.
+    """
+    measurement = Measurement(name)
+    token = _active.set((*_active.get(), measurement))
+    start = time.perf_counter()
+    try:
+        with _wrap_connections():
+            yield measurement
+    finally:
+        measurement.duration = time.perf_counter() - start
+        _active.reset(token)
+        if (completed := _completed.get()) is not None:
+            completed.append(measurement)
+        logger.info(
+            "scope=%s queries=%d db_ms=%.1f render_ms=%.1f duration_ms=%.1f",
+            name,
+            measurement.queries,
+            measurement.db_time * 1000,
+            measurement.render_time * 1000,
+            measurement.duration * 1000,
+            extra={"netbox_osd": measurement.as_dict()},
+        )
+
+
+@contextmanager
+def rendering():
+    """
+    Count the enclosed block as render time of every open scope.  Nested
+    blocks (templates included by a template being rendered) are counted
+    once.
+    """
+    measurements = [m for m in _active.get() if not m.rendering]
+    for measurement in measurements:
+        measurement.rendering = True
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - start
+        for measurement in measurements:
+            measurement.rendering = False
+            measurement.render_time += elapsed
+
+
+def install_template_timing():
+    """
+    Wrap Template.render so that template rendering inside an open scope
+    counts as render time.  Called once, by InstrumentationMiddleware, when
+    instrumentation is enabled.
+    """
+    if not getattr(Template.render, "netbox_osd_timed", False):
+        Template.render = _time_template_render(Template.render)
+
+
+def _time_template_render(render):
+    @functools.wraps(render)
+    def wrapper(self, *args, **kwargs):
+        if not _active.get():
+            return render(self, *args, **kwargs)
+        with rendering():
+            return render(self, *args, **kwargs)
+    wrapper.netbox_osd_timed = True
+    return wrapper
+
+
+@contextmanager
+def _wrap_connections():
+    # Only the outermost scope installs the wrapper; inner scopes share it
+    if len(_active.get()) > 1:
+        yield
+        return
+    with ExitStack() as stack:
+        for connection in connections.all():
+            stack.enter_context(connection.execute_wrapper(_count_query))
+        yield
+
+
+def instrumented(name):
+    """
+    Decorator measuring each call of a template extension method (or any
+    other callable) as scope `name` when instrumentation is enabled.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not is_enabled():
+                return func(*args, **kwargs)
+            with measure(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def server_timing(measurements):
+    return ", ".join(
+        f'{metric};dur={value * 1000:.1f};desc="{m.name}"'
+        for i, m in enumerate(measurements)
+        for metric, value in ((f"db{i}", m.db_time), (f"render{i}", m.render_time), (f"total{i}", m.duration))
+    )
+
+
+class InstrumentationMiddleware:
+    """
+    Measure requests to plugin views and API endpoints, and report those and
+    any scopes measured within other requests (template extensions) in the
+    response headers.  Installed only while the ``instrument`` setting is on.
+    """
+
+    def __init__(self, get_response):
+        if not is_enabled():
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        # Reached only with instrumentation enabled; times templates which views
+        # render eagerly, before the response reaches this middleware
+        install_template_timing()
+
+    def __call__(self, request):
+        measurements = []
+        token = _completed.set(measurements)
+        try:
+            if scope := self.get_scope(request):
+                with measure(scope):
+                    response = self.get_response(request)
+                    # Render deferred (DRF and template) responses inside the scope
+                    if hasattr(response, "render") and not getattr(response, "is_rendered", True):
+                        with rendering():
+                            response.render()
+            else:
+                response = self.get_response(request)
+        finally:
+            _completed.reset(token)
+
+        if measurements:
+            # The request's own scope completes last; list it first
+            measurements.reverse()
+            response["Server-Timing"] = server_timing(measurements)
+            response["X-NetBox-OSD-Queries"] = ", ".join(f"{m.name}={m.queries}" for m in measurements)
+        return response
+
+    @staticmethod
+    def get_scope(request):
+        try:
+            match = resolve(request.path_info)
+        except Resolver404:
+            return None
+        if NAMESPACES & set(match.namespaces):
+            return match.view_name
+        return None
@@ -0,0 +1,227 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from extras.models import Tag
+from netbox.context_managers import event_tracking
+from netbox.jobs import JobRunner
+from utilities.exceptions import PermissionsViolation
+from utilities.request import NetBoxFakeRequest
+
+from .forms import CephOSDStatusNoteImportForm
+from .importers import CephOSDBulkImporter
+from .models import CephCluster, CephOSD, CephOSDStatusNote
+from .sync import CephSync
+from .transitions import CephOSDTransition
+
+
+class CephSyncJob(JobRunner):
+    """
+    Background job applying ``ceph osd tree`` / ``ceph osd dump`` output to a
+    CephCluster.  Enqueue with the cluster as the job's object:
+
+        CephSyncJob.enqueue(instance=cluster, user=user, tree=tree, dump=dump)
+    """
+
+    class Meta:
+        name = "Ceph OSD sync"
+
+    def run(self, tree, dump, *args, **kwargs):
+        sync = CephSync(self.job.object, user=self.job.user, request_id=self.job.job_id)
+        self.job.data = sync.run(tree, dump)
+
+
+class CephBulkJob(JobRunner):
+    """
+    Base for jobs which take over large imports and bulk edits from the web
+    request.  Rows are processed in chunks of ``chunk_size``, each committed
+    in its own transaction; failed chunks are skipped and their errors kept.
+    Progress is saved to the job's data after every chunk, and the errors can
+    be downloaded as a CSV report (CephJobReportView).
+
+    As in NetBox's bulk views, the objects written by each chunk are checked
+    against the job user's object permissions before the chunk commits; a
+    chunk writing any object outside them is rolled back.
+    """
+    chunk_size = 500
+
+    def start_progress(self, total):
+        self.job.data = {"total": total, "processed": 0, "errors": []}
+        self.job.save(update_fields=["data"])
+
+    def update_progress(self, processed, errors=(), **counts):
+        data = self.job.data
+        data["processed"] = processed
+        data["errors"].extend(errors)
+        for key, count in counts.items():
+            data[key] = data.get(key, 0) + count
+        self.job.save(update_fields=["data"])
+
+    def check_permitted(self, model, objects, action):
+        """
+        Raise PermissionsViolation unless the job's user may `action` every
+        one of `objects` as written.
+        """
+        CephOSDBulkImporter.check_permitted(objects, model.objects.restrict(self.job.user, action))
+
+    def fake_request(self):
+        """
+        Stand-in request so that objects saved by the job are change-logged
+        against the job's user, as in the web request.
+        """
+        return NetBoxFakeRequest({
+            "META": {},
+            "COOKIES": {},
+            "POST": {},
+            "GET": {},
+            "FILES": {},
+            "user": self.job.user,
+            "path": "",
+            "id": self.job.job_id,
+        })
+
+
+class CephOSDImportJob(CephBulkJob):
+    """
+    Import CephOSD CSV records through CephOSDBulkImporter.  With ``upsert``,
+    existing OSDs are updated in place, as in CephOSDUpsertImportView.
+    """
+
+    class Meta:
+        name = "Ceph OSD import"
+
+    def run(self, records, upsert=False, *args, **kwargs):
+        user = self.job.user
+        importer = CephOSDBulkImporter(user=user, request_id=self.job.job_id)
+        self.start_progress(len(records))
+
+        for start in range(0, len(records), self.chunk_size):
+            chunk = records[start:start + self.chunk_size]
+            counts = {}
+            errors = []
+            try:
+                with transaction.atomic():
+                    if upsert:
+                        result = importer.upsert(
+                            chunk, partial=True, start=start + 1, permitted=CephOSD.objects.restrict(user, "change")
+                        )
+                        self.check_permitted(CephOSD, result["created"], "add")
+                        self.check_permitted(CephOSD, result["updated"], "change")
+                        counts = {key: len(objects) for key, objects in result.items()}
+                    else:
+                        created = importer.create(chunk, start=start + 1)
+                        self.check_permitted(CephOSD, created, "add")
+                        counts = {"created": len(created)}
+            except ValidationError as e:
+                errors = e.messages
+            except PermissionsViolation:
+                errors = [f"Records {start + 1}-{start + len(chunk)}: permission denied"]
+            self.update_progress(start + len(chunk), errors, **counts)
+
+
+class CephOSDStatusNoteImportJob(CephBulkJob):
+    """
+    Import CephOSDStatusNote CSV records, saving each row through
+    CephOSDStatusNoteImportForm.
+    """
+
+    class Meta:
+        name = "Ceph OSD status note import"
+
+    def run(self, records, *args, **kwargs):
+        osd_map = CephOSD.objects.restrict(self.job.user, "view").resolve_natural_keys(
+            (record.get("osd_device"), record.get("osd_name")) for record in records
+        )
+        self.start_progress(len(records))
+
+        with event_tracking(self.fake_request()):
+            for start in range(0, len(records), self.chunk_size):
+                end = min(start + self.chunk_size, len(records))
+                created = []
+                errors = []
+                try:
+                    with transaction.atomic():
+                        for i, record in enumerate(records[start:end], start=start + 1):
+                            form = CephOSDStatusNoteImportForm(data=record, osd_map=osd_map)
+                            if not form.is_valid():
+                                errors.extend(
+                                    f"Record {i}: {field}: {message}" if field != "__all__"
+                                    else f"Record {i}: {message}"
+                                    for field, messages in form.errors.items()
+                                    for message in messages
+                                )
+                                continue
+                            created.append(form.save())
+                        self.check_permitted(CephOSDStatusNote, created, "add")
+                except PermissionsViolation:
+                    created = []
+                    errors.append(f"Records {start + 1}-{end}: permission denied")
+                self.update_progress(end, errors, created=len(created))
+
+
+class CephOSDBulkEditJob(CephBulkJob):
+    """
+    Apply a CephOSDBulkEditView edit to a list of OSD IDs.  A status-only
+    edit by a user who may add status notes runs as a CephOSDTransition;
+    anything else saves each OSD in turn.
+    """
+
+    class Meta:
+        name = "Ceph OSD bulk edit"
+
+    def run(self, pks, changes, nullify=(), add_tags=(), remove_tags=(), reason="", *args, **kwargs):
+        self.start_progress(len(pks))
+        osds = CephOSD.objects.restrict(self.job.user, "change").filter(pk__in=pks)
+
+        status_only = set(changes) == {"status"} and not (nullify or add_tags or remove_tags)
+        # As in CephOSDBulkEditView, users who may not add status notes get a
+        # plain per-OSD update instead of a transition
+        if status_only and self.job.user.has_perm("netbox_osd.add_cephosdstatusnote"):
+            transition = CephOSDTransition(user=self.job.user, request_id=self.job.job_id)
+            try:
+                with transaction.atomic():
+                    result = transition.run(osds, changes["status"], reason)
+                    self.check_permitted(CephOSD, result["updated"], "change")
+                    self.check_permitted(CephOSDStatusNote, result["notes"], "add")
+            except PermissionsViolation:
+                self.update_progress(len(pks), ["Permission denied"])
+                return
+            self.update_progress(len(pks), updated=len(result["updated"]), notes=len(result["notes"]))
+            return
+
+        if "cluster" in changes:
+            changes["cluster"] = CephCluster.objects.get(pk=changes["cluster"])
+        add_tags = list(Tag.objects.filter(pk__in=add_tags))
+        remove_tags = list(Tag.objects.filter(pk__in=remove_tags))
+        with event_tracking(self.fake_request()):
+            for start in range(0, len(pks), self.chunk_size):
+                end = min(start + self.chunk_size, len(pks))
+                updated = []
+                errors = []
+                try:
+                    with transaction.atomic():
+                        for osd in osds.filter(pk__in=pks[start:end]).prefetch_related("tags"):
+                            osd.snapshot()
+                            for field, value in changes.items():
+                                setattr(osd, field, value)
+                            for field in nullify:
+                                setattr(osd, field, None)
+                            try:
+                                osd.full_clean()
+                            except ValidationError as e:
+                                errors.extend(f"{osd}: {message}" for message in e.messages)
+                                continue
+                            osd.save()
+                            if add_tags:
+                                osd.tags.add(*add_tags)
+                            if remove_tags:
+                                osd.tags.remove(*remove_tags)
+                            updated.append(osd)
+                        # The edited OSDs must still be within the user's change constraints
+                        self.check_permitted(CephOSD, updated, "change")
+                except PermissionsViolation:
+                    updated = []
+                    errors.append(f"OSDs {start + 1}-{end}: permission denied")
+                self.update_progress(end, errors, updated=len(updated))
+
+
+# Jobs whose error report can be downloaded from CephJobReportView
+BULK_JOBS = (CephOSDImportJob, CephOSDStatusNoteImportJob, CephOSDBulkEditJob)
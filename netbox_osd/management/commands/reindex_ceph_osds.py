@@ -0,0 +1,53 @@
+from core.models import ObjectType
+from django.core.management.base import BaseCommand, CommandError
+from extras.models import CachedValue
+from netbox.search.backends import search_backend
+
+from netbox_osd.search import CephClusterIndex, CephOSDIndex, CephOSDStatusNoteIndex
+
+# Related objects rendered into each model's cached values
+INDEXERS = {
+    "cluster": (CephClusterIndex, ("site",)),
+    "osd": (CephOSDIndex, ("cluster", "device")),
+    "note": (CephOSDStatusNoteIndex, ("osd__device",)),
+}
+
+
+class Command(BaseCommand):
+    help = "Rebuild the global search cache for Ceph clusters, OSDs and status notes in chunks"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "models",
+            nargs="*",
+            help=f"Models to reindex: {', '.join(INDEXERS)} (default: all)",
+        )
+        parser.add_argument("--chunk-size", type=int, default=2000)
+        parser.add_argument(
+            "--lazy",
+            action="store_true",
+            help="Replace cached values object by object instead of clearing them first",
+        )
+
+    def handle(self, *args, **options):
+        if unknown := set(options["models"]) - INDEXERS.keys():
+            raise CommandError(f"Unknown models: {', '.join(sorted(unknown))}")
+
+        for name in options["models"] or INDEXERS:
+            indexer, related = INDEXERS[name]
+            model = indexer.model
+
+            if not options["lazy"]:
+                object_type = ObjectType.objects.get_for_model(model)
+                deleted, _ = CachedValue.objects.filter(object_type=object_type).delete()
+                self.stdout.write(f"Cleared {deleted} cached values for {model._meta.verbose_name_plural}")
+
+            # Walk the table in primary key order so each chunk is an index range scan
+            queryset = model.objects.select_related(*related).order_by("pk")
+            total = 0
+            last_pk = 0
+            while chunk := list(queryset.filter(pk__gt=last_pk)[:options["chunk_size"]]):
+                total += search_backend.cache(chunk, indexer=indexer, remove_existing=options["lazy"])
+                last_pk = chunk[-1].pk
+                self.stdout.write(f"  {model._meta.verbose_name_plural}: {total} values cached", ending="\r")
+            self.stdout.write(f"Cached {total} values for {model._meta.verbose_name_plural}")
@@ -0,0 +1,171 @@
+import random
+import time
+from decimal import Decimal
+
+from dcim.models import Device, DeviceRole, DeviceType, Manufacturer, Rack, Site
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils.timezone import now
+
+from netbox_osd.choices import NoteStatusChoices, OSDStatusChoices, OSDTypeChoices
+from netbox_osd.history import record_transitions
+from netbox_osd.models import CephCluster, CephOSD, CephOSDStatusNote
+
+# Raw size in TB of each seeded OSD type
+OSD_SIZES = {
+    OSDTypeChoices.HDD: 16,
+    OSDTypeChoices.SSD: 4,
+    OSDTypeChoices.NVME: 8,
+}
+
+# One OSD in this many is seeded down, and one in this many out
+DOWN_EVERY = 50
+OUT_EVERY = 200
+
+NOTE_STATUSES = (
+    NoteStatusChoices.DOWN,
+    NoteStatusChoices.OUT,
+    NoteStatusChoices.MAINTENANCE,
+    NoteStatusChoices.RECOVERED,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Bulk-create a synthetic Ceph topology (sites, racks, hosts, clusters, OSDs and "
+        "status notes) for load testing and benchmarks"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--prefix", default="seed", help="Name and slug prefix of every seeded object")
+        parser.add_argument("--sites", type=int, default=1)
+        parser.add_argument("--racks-per-site", type=int, default=5)
+        parser.add_argument("--hosts-per-rack", type=int, default=20)
+        parser.add_argument(
+            "--clusters",
+            type=int,
+            default=1,
+            help="Hosts are split evenly between this many clusters",
+        )
+        parser.add_argument("--osds-per-host", type=int, default=12)
+        parser.add_argument("--notes-per-osd", type=int, default=0)
+        parser.add_argument("--seed", type=int, default=0, help="Random seed for sizes, usage and flags")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        prefix = options["prefix"]
+        if Site.objects.filter(slug__startswith=f"{prefix}-site-").exists():
+            raise CommandError(f"Objects with the prefix '{prefix}' already exist; pick another --prefix")
+        if options["clusters"] < 1:
+            raise CommandError("--clusters must be at least 1")
+
+        self.rng = random.Random(options["seed"])
+        self.chunk_size = options["chunk_size"]
+        start = time.perf_counter()
+
+        with transaction.atomic():
+            devices = self.seed_hosts(prefix, options["sites"], options["racks_per_site"], options["hosts_per_rack"])
+            clusters = CephCluster.objects.bulk_create([
+                CephCluster(name=f"{prefix}-cluster-{i:02d}") for i in range(options["clusters"])
+            ])
+            osds = self.seed_osds(devices, clusters, options["osds_per_host"])
+            notes = self.seed_notes(osds, options["notes_per_osd"])
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(devices)} hosts, {len(clusters)} clusters, {len(osds)} OSDs and {notes} status notes "
+            f"in {time.perf_counter() - start:.1f}s"
+        ))
+        self.stdout.write("Run reindex_ceph_osds to make them searchable.")
+
+    def seed_hosts(self, prefix, sites, racks_per_site, hosts_per_rack):
+        manufacturer, _ = Manufacturer.objects.get_or_create(slug=f"{prefix}-mfr", defaults={"name": f"{prefix}-mfr"})
+        device_type, _ = DeviceType.objects.get_or_create(
+            manufacturer=manufacturer,
+            slug=f"{prefix}-storage-node",
+            defaults={"model": f"{prefix}-storage-node"},
+        )
+        role, _ = DeviceRole.objects.get_or_create(slug=f"{prefix}-storage", defaults={"name": f"{prefix}-storage"})
+
+        sites = Site.objects.bulk_create([
+            Site(name=f"{prefix}-site-{i:02d}", slug=f"{prefix}-site-{i:02d}") for i in range(sites)
+        ])
+        racks = Rack.objects.bulk_create([
+            Rack(site=site, name=f"{prefix}-rack-{s:02d}-{r:03d}")
+            for s, site in enumerate(sites)
+            for r in range(racks_per_site)
+        ])
+        return Device.objects.bulk_create(
+            [
+                Device(
+                    site=rack.site,
+                    rack=rack,
+                    device_type=device_type,
+                    role=role,
+                    name=f"{rack.name.replace('-rack-', '-host-')}-{h:02d}",
+                )
+                for rack in racks
+                for h in range(hosts_per_rack)
+            ],
+            batch_size=self.chunk_size,
+        )
+
+    def seed_osds(self, devices, clusters, osds_per_host):
+        osds = []
+        next_id = {cluster.pk: 0 for cluster in clusters}
+        types = list(OSD_SIZES)
+        for i, device in enumerate(devices):
+            cluster = clusters[i * len(clusters) // len(devices)]
+            for _ in range(osds_per_host):
+                osd_id = next_id[cluster.pk]
+                next_id[cluster.pk] += 1
+                osd_type = types[osd_id % len(types)]
+                size_tb = OSD_SIZES[osd_type]
+                if osd_id % OUT_EVERY == OUT_EVERY - 1:
+                    status = OSDStatusChoices.OUT
+                elif osd_id % DOWN_EVERY == DOWN_EVERY - 1:
+                    status = OSDStatusChoices.DOWN
+                else:
+                    status = OSDStatusChoices.ACTIVE
+                size_bytes = size_tb * 10**12
+                osds.append(CephOSD(
+                    cluster=cluster,
+                    device=device,
+                    name=f"osd.{osd_id}",
+                    osd_id=osd_id,
+                    osd_type=osd_type,
+                    encrypted=self.rng.random() < 0.5,
+                    status=status,
+                    size_bytes=size_bytes,
+                    used_bytes=int(size_bytes * self.rng.uniform(0.2, 0.8)),
+                    crush_weight=Decimal(size_tb * 10**12 / 2**40).quantize(Decimal("0.00001")),
+                    reweight=Decimal("1.00000") if status == OSDStatusChoices.ACTIVE else Decimal("0.00000"),
+                ))
+
+        osds = CephOSD.objects.bulk_create(osds, batch_size=self.chunk_size)
+        timestamp = now()
+        for start in range(0, len(osds), self.chunk_size):
+            record_transitions(
+                [(osd.pk, None, osd.status) for osd in osds[start:start + self.chunk_size]],
+                timestamp,
+            )
+        return osds
+
+    def seed_notes(self, osds, notes_per_osd):
+        if not notes_per_osd:
+            return 0
+        created = 0
+        for start in range(0, len(osds), self.chunk_size):
+            notes = []
+            for osd in osds[start:start + self.chunk_size]:
+                for n in range(notes_per_osd):
+                    # Every OSD's latest note is left open unless the OSD is active
+                    resolved = n < notes_per_osd - 1 or osd.status == OSDStatusChoices.ACTIVE
+                    notes.append(CephOSDStatusNote(
+                        osd=osd,
+                        status=self.rng.choice(NOTE_STATUSES),
+                        reason=f"Seeded note {n + 1} for {osd.name}",
+                        resolved=resolved,
+                        resolved_at=now() if resolved else None,
+                    ))
+            created += len(CephOSDStatusNote.objects.bulk_create(notes, batch_size=self.chunk_size))
+        return created
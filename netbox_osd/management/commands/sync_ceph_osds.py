@@ -0,0 +1,89 @@
+import json
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from utilities.exceptions import PermissionsViolation
+
+from netbox_osd.jobs import CephSyncJob
+from netbox_osd.models import CephCluster
+from netbox_osd.sync import CephSync
+
+
+class DryRun(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Sync CephOSD state from the JSON output of `ceph osd tree -f json` and "
+        "`ceph osd dump -f json`. Pass - to read one of them from stdin."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--cluster", required=True, help="Name of the CephCluster to sync")
+        parser.add_argument("--tree", required=True, help="Path to `ceph osd tree -f json` output, or -")
+        parser.add_argument("--dump", required=True, help="Path to `ceph osd dump -f json` output, or -")
+        parser.add_argument(
+            "--user",
+            help="Username to record in the change log; the sync is held to this user's object permissions",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Report the changes without saving them")
+        parser.add_argument("--background", action="store_true", help="Enqueue a background job instead")
+
+    def handle(self, *args, **options):
+        if options["tree"] == "-" and options["dump"] == "-":
+            raise CommandError("Only one of --tree and --dump can be read from stdin.")
+
+        try:
+            cluster = CephCluster.objects.get(name=options["cluster"])
+        except CephCluster.DoesNotExist:
+            raise CommandError(f"Cluster '{options['cluster']}' not found")
+
+        user = None
+        if options["user"]:
+            try:
+                user = get_user_model().objects.get(username=options["user"])
+            except get_user_model().DoesNotExist:
+                raise CommandError(f"User '{options['user']}' not found")
+
+        tree = self.load(options["tree"])
+        dump = self.load(options["dump"])
+
+        if options["background"]:
+            job = CephSyncJob.enqueue(instance=cluster, user=user, tree=tree, dump=dump)
+            self.stdout.write(f"Enqueued job {job.pk} ({job.job_id})")
+            return
+
+        sync = CephSync(cluster, user=user)
+        try:
+            with transaction.atomic():
+                result = sync.run(tree, dump)
+                if options["dry_run"]:
+                    raise DryRun
+        except DryRun:
+            self.stdout.write("Dry run: no changes saved")
+        except ValidationError as e:
+            raise CommandError("Sync failed:\n" + "\n".join(e.messages))
+        except PermissionsViolation:
+            raise CommandError(f"Sync failed: user '{options['user']}' may not change all of the synced OSDs")
+
+        self.stdout.write(
+            f"{cluster}: created {result['created']}, updated {result['updated']}, "
+            f"unchanged {result['unchanged']}, status notes {result['notes']}"
+        )
+        if result["unknown_hosts"]:
+            self.stderr.write("Skipped unknown hosts: " + ", ".join(result["unknown_hosts"]))
+        if result["missing"]:
+            self.stderr.write("OSDs not in the tree: " + ", ".join(result["missing"]))
+
+    def load(self, path):
+        try:
+            if path == "-":
+                return json.load(sys.stdin)
+            with open(path) as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            raise CommandError(f"Cannot read {path}: {e}")
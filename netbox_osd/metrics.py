@@ -0,0 +1,77 @@
+"""
+Prometheus metrics for the OSD inventory.
+
+The exposition text is built from two grouped queries, OSD counts and open
+status note counts, and cached as a whole for ``metrics_cache_timeout``
+seconds, so frequent scrapes from several Prometheus servers share one
+computation.  There is no invalidation: figures may lag by up to the TTL.
+"""
+from django.core.cache import cache
+from django.db.models import Count
+from netbox.plugins import get_plugin_config
+
+CACHE_KEY = "netbox_osd:metrics"
+
+# (metric name, help text, labels) of the exported gauges
+OSD_METRIC = (
+    "netbox_osd_osds",
+    "Number of Ceph OSDs.",
+    ("cluster", "site", "status", "osd_type", "encrypted"),
+)
+NOTE_METRIC = (
+    "netbox_osd_open_status_notes",
+    "Number of unresolved Ceph OSD status notes.",
+    ("cluster", "status"),
+)
+
+
+def escape_label(value):
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def render_metric(metric, rows):
+    """
+    Render one gauge in the Prometheus text format.  `rows` are
+    ``(label values, value)`` pairs in the order of the metric's labels.
+    """
+    name, help_text, labels = metric
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+    for values, value in rows:
+        label_text = ",".join(f'{label}="{escape_label(v)}"' for label, v in zip(labels, values))
+        lines.append(f"{name}{{{label_text}}} {value}")
+    return lines
+
+
+def compute_metrics():
+    from .models import CephOSD, CephOSDStatusNote
+
+    osd_rows = (
+        CephOSD.objects.order_by()
+        .values_list("cluster__name", "device__site__name", "status", "osd_type", "encrypted")
+        .annotate(count=Count("pk"))
+    )
+    note_rows = (
+        CephOSDStatusNote.objects.filter(resolved=False)
+        .order_by()
+        .values_list("osd__cluster__name", "status")
+        .annotate(count=Count("pk"))
+    )
+    lines = [
+        *render_metric(OSD_METRIC, ((row[:-1], row[-1]) for row in osd_rows)),
+        *render_metric(NOTE_METRIC, ((row[:-1], row[-1]) for row in note_rows)),
+    ]
+    return "\n".join(lines) + "\n"
+
+
+def get_metrics():
+    """
+    Return the exposition text, from the cache where possible.
+    """
+    if (metrics := cache.get(CACHE_KEY)) is None:
+        metrics = compute_metrics()
+        cache.set(CACHE_KEY, metrics, timeout=get_plugin_config("netbox_osd", "metrics_cache_timeout"))
+    return metrics
@@ -0,0 +1,57 @@
+import django.contrib.postgres.indexes
+import django.db.models.functions.text
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_osd", "0003_cephcluster_site"),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddIndex(
+            model_name="cephosd",
+            index=models.Index(fields=["cluster", "status"], name="netbox_osd_cluster_status"),
+        ),
+        migrations.AddIndex(
+            model_name="cephosd",
+            index=models.Index(fields=["status", "osd_type"], name="netbox_osd_status_type"),
+        ),
+        migrations.AddIndex(
+            model_name="cephosd",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("name"), name="gin_trgm_ops"
+                ),
+                name="netbox_osd_name_trgm",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cephosdstatusnote",
+            index=models.Index(fields=["created", "id"], name="netbox_osd_note_created"),
+        ),
+        migrations.AddIndex(
+            model_name="cephosdstatusnote",
+            index=models.Index(fields=["resolved", "status"], name="netbox_osd_note_res_status"),
+        ),
+        migrations.AddIndex(
+            model_name="cephosdstatusnote",
+            index=models.Index(
+                condition=models.Q(("resolved", False)),
+                fields=["osd"],
+                name="netbox_osd_note_open",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cephosdstatusnote",
+            index=django.contrib.postgres.indexes.GinIndex(
+                django.contrib.postgres.indexes.OpClass(
+                    django.db.models.functions.text.Upper("reason"), name="gin_trgm_ops"
+                ),
+                name="netbox_osd_note_reason_trgm",
+            ),
+        ),
+    ]
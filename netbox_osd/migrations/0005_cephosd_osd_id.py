@@ -0,0 +1,66 @@
+import re
+
+from django.db import migrations, models
+
+OSD_NAME_RE = re.compile(r"^osd\.(\d+)$")
+OSD_ID_MAX = 2147483647
+
+
+def populate_osd_ids(apps, schema_editor):
+    """
+    Backfill osd_id from each OSD's name.  Names that don't parse, IDs too
+    large for the column and IDs already taken within the same cluster are
+    left NULL.
+    """
+    CephOSD = apps.get_model("netbox_osd", "CephOSD")
+
+    seen = set()
+    changed = []
+    for osd in CephOSD.objects.order_by("pk").only("pk", "name", "cluster_id").iterator(chunk_size=2000):
+        if not (match := OSD_NAME_RE.match(osd.name)):
+            continue
+        osd.osd_id = int(match.group(1))
+        if osd.osd_id > OSD_ID_MAX:
+            continue
+        if osd.cluster_id is not None:
+            if (osd.cluster_id, osd.osd_id) in seen:
+                continue
+            seen.add((osd.cluster_id, osd.osd_id))
+        changed.append(osd)
+
+    CephOSD.objects.bulk_update(changed, ["osd_id"], batch_size=2000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_osd", "0004_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cephosd",
+            name="osd_id",
+            field=models.PositiveIntegerField(
+                blank=True,
+                db_index=True,
+                editable=False,
+                help_text="Numeric Ceph OSD ID, parsed from the name",
+                null=True,
+                verbose_name="OSD ID",
+            ),
+        ),
+        migrations.RunPython(populate_osd_ids, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name="cephosd",
+            constraint=models.UniqueConstraint(fields=["cluster", "osd_id"], name="netbox_osd_cluster_osd_id"),
+        ),
+        migrations.AlterModelOptions(
+            name="cephosd",
+            options={
+                "ordering": ["device", "osd_id", "name"],
+                "verbose_name": "Ceph OSD",
+                "verbose_name_plural": "Ceph OSDs",
+            },
+        ),
+    ]
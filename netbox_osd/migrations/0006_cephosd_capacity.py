@@ -0,0 +1,67 @@
+import django.core.validators
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_osd", "0005_cephosd_osd_id"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="cephosd",
+            name="size_bytes",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Raw capacity of the OSD",
+                null=True,
+                verbose_name="Size (bytes)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cephosd",
+            name="used_bytes",
+            field=models.PositiveBigIntegerField(
+                blank=True,
+                help_text="Raw capacity in use, as reported by ceph osd df",
+                null=True,
+                verbose_name="Used (bytes)",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cephosd",
+            name="crush_weight",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=5,
+                max_digits=10,
+                null=True,
+                validators=[django.core.validators.MinValueValidator(0)],
+                verbose_name="CRUSH weight",
+            ),
+        ),
+        migrations.AddField(
+            model_name="cephosd",
+            name="reweight",
+            field=models.DecimalField(
+                blank=True,
+                decimal_places=5,
+                help_text="Override weight between 0 and 1",
+                max_digits=6,
+                null=True,
+                validators=[
+                    django.core.validators.MinValueValidator(0),
+                    django.core.validators.MaxValueValidator(1),
+                ],
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="cephosd",
+            index=models.Index(
+                fields=["cluster", "osd_type"],
+                include=["status", "size_bytes", "used_bytes"],
+                name="netbox_osd_capacity",
+            ),
+        ),
+    ]
@@ -0,0 +1,86 @@
+import django.contrib.postgres.indexes
+import django.db.models.deletion
+from django.db import migrations, models
+
+# Seed the history with one baseline row per existing OSD: its current status,
+# with a null from_status because the status before it is unknown.  The row
+# is dated from the OSD's latest change log entry which set that status,
+# falling back to its creation if the change log holds none.
+BACKFILL_SQL = """
+INSERT INTO netbox_osd_cephosdstatustransition (osd_id, from_status, to_status, ts)
+SELECT osd.id,
+       NULL,
+       CASE osd.status
+           WHEN 'active' THEN 1
+           WHEN 'down' THEN 2
+           WHEN 'out' THEN 3
+           WHEN 'destroyed' THEN 4
+       END,
+       COALESCE(
+           (
+               SELECT max(oc.time)
+               FROM core_objectchange oc
+               WHERE oc.changed_object_type_id = (
+                         SELECT id FROM django_content_type WHERE app_label = 'netbox_osd' AND model = 'cephosd'
+                     )
+                 AND oc.changed_object_id = osd.id
+                 AND oc.postchange_data ->> 'status' = osd.status
+                 AND oc.prechange_data ->> 'status' IS DISTINCT FROM osd.status
+           ),
+           osd.created
+       )
+FROM netbox_osd_cephosd osd
+WHERE osd.status IN ('active', 'down', 'out', 'destroyed')
+"""
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("netbox_osd", "0006_cephosd_capacity"),
+        # The backfill reads core_objectchange
+        ("core", "0011_move_objectchange"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CephOSDStatusTransition",
+            fields=[
+                ("id", models.BigAutoField(primary_key=True, serialize=False)),
+                (
+                    "from_status",
+                    models.PositiveSmallIntegerField(
+                        blank=True,
+                        choices=[(1, "active"), (2, "down"), (3, "out"), (4, "destroyed")],
+                        null=True,
+                    ),
+                ),
+                (
+                    "to_status",
+                    models.PositiveSmallIntegerField(
+                        choices=[(1, "active"), (2, "down"), (3, "out"), (4, "destroyed")],
+                    ),
+                ),
+                ("ts", models.DateTimeField(verbose_name="Timestamp")),
+                (
+                    "osd",
+                    models.ForeignKey(
+                        db_index=False,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="status_transitions",
+                        to="netbox_osd.cephosd",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "OSD Status Transition",
+                "verbose_name_plural": "OSD Status Transitions",
+                "ordering": ["ts", "id"],
+                "indexes": [
+                    models.Index(fields=["osd", "ts"], name="netbox_osd_transition_osd_ts"),
+                    django.contrib.postgres.indexes.BrinIndex(fields=["ts"], name="netbox_osd_transition_ts"),
+                ],
+            },
+        ),
+        migrations.RunSQL(BACKFILL_SQL, migrations.RunSQL.noop),
+    ]
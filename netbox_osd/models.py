@@ -1,8 +1,33 @@
+import re
+
+from django.contrib.postgres.indexes import BrinIndex, GinIndex, OpClass
+from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models.functions import Upper
 from django.urls import reverse
+from django.utils.functional import cached_property
 from netbox.models import NetBoxModel
+from utilities.querysets import RestrictedQuerySet
+
+from .choices import OSD_STATUS_CODE_CHOICES, OSDStatusChoices, OSDTypeChoices, NoteStatusChoices
+from .querysets import CephClusterQuerySet, CephOSDQuerySet
+
+OSD_NAME_RE = re.compile(r"^osd\.(\d+)$")
+
+# Largest value CephOSD.osd_id (a PositiveIntegerField) can store
+OSD_ID_MAX = 2147483647
 
-from .choices import OSDStatusChoices, OSDTypeChoices, NoteStatusChoices
+
+def parse_osd_id(name):
+    """
+    Return the numeric Ceph OSD ID from a name like ``osd.42``, or None if
+    the name doesn't parse or the ID exceeds OSD_ID_MAX.
+    """
+    if match := OSD_NAME_RE.match(name or ""):
+        if (osd_id := int(match.group(1))) <= OSD_ID_MAX:
+            return osd_id
+    return None
 
 
 class CephCluster(NetBoxModel):
@@ -21,6 +46,8 @@ class CephCluster(NetBoxModel):
     )
     description = models.TextField(blank=True)
 
+    objects = CephClusterQuerySet.as_manager()
+
     clone_fields = ["site", "description"]
 
     class Meta:
@@ -34,13 +61,38 @@ class CephCluster(NetBoxModel):
     def get_absolute_url(self):
         return reverse("plugins:netbox_osd:cephcluster", args=[self.pk])
 
+    # osd_count and node_count are populated by CephClusterQuerySet.with_counts()
+    # when available; otherwise they fall back to a query.
+
     @property
     def osd_count(self):
-        return self.osds.count()
+        count = getattr(self, "_osd_count", None)
+        if count is None:
+            return self.osds.count()
+        return count
+
+    @osd_count.setter
+    def osd_count(self, value):
+        self._osd_count = value
 
     @property
     def node_count(self):
-        return self.osds.values("device").distinct().count()
+        count = getattr(self, "_node_count", None)
+        if count is None:
+            return self.osds.values("device").distinct().count()
+        return count
+
+    @node_count.setter
+    def node_count(self, value):
+        self._node_count = value
+
+    @cached_property
+    def summary(self):
+        """
+        Cached health summary (see summary.py).
+        """
+        from .summary import get_summary
+        return get_summary(self.pk)
 
 
 class CephOSD(NetBoxModel):
@@ -63,6 +115,14 @@ class CephOSD(NetBoxModel):
         max_length=100,
         help_text="OSD identifier, e.g. osd.0, osd.42",
     )
+    osd_id = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        editable=False,
+        db_index=True,
+        verbose_name="OSD ID",
+        help_text="Numeric Ceph OSD ID, parsed from the name",
+    )
     device = models.ForeignKey(
         to="dcim.Device",
         on_delete=models.CASCADE,
@@ -84,18 +144,63 @@ class CephOSD(NetBoxModel):
         choices=OSDStatusChoices,
         default=OSDStatusChoices.ACTIVE,
     )
+    size_bytes = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Size (bytes)",
+        help_text="Raw capacity of the OSD",
+    )
+    used_bytes = models.PositiveBigIntegerField(
+        null=True,
+        blank=True,
+        verbose_name="Used (bytes)",
+        help_text="Raw capacity in use, as reported by ceph osd df",
+    )
+    crush_weight = models.DecimalField(
+        max_digits=10,
+        decimal_places=5,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0)],
+        verbose_name="CRUSH weight",
+    )
+    reweight = models.DecimalField(
+        max_digits=6,
+        decimal_places=5,
+        null=True,
+        blank=True,
+        validators=[MinValueValidator(0), MaxValueValidator(1)],
+        help_text="Override weight between 0 and 1",
+    )
     description = models.TextField(
         blank=True,
         help_text="Optional notes about this OSD (drive path, pool, etc.)",
     )
 
+    objects = CephOSDQuerySet.as_manager()
+
     clone_fields = ["cluster", "device", "osd_type", "encrypted", "status"]
 
     class Meta:
-        ordering = ["device", "name"]
+        ordering = ["device", "osd_id", "name"]
         verbose_name = "Ceph OSD"
         verbose_name_plural = "Ceph OSDs"
         unique_together = [["device", "name"]]
+        constraints = [
+            models.UniqueConstraint(fields=["cluster", "osd_id"], name="netbox_osd_cluster_osd_id"),
+        ]
+        indexes = [
+            models.Index(fields=["cluster", "status"], name="netbox_osd_cluster_status"),
+            models.Index(fields=["status", "osd_type"], name="netbox_osd_status_type"),
+            # Serves name__icontains searches, which compare UPPER(name)
+            GinIndex(OpClass(Upper("name"), name="gin_trgm_ops"), name="netbox_osd_name_trgm"),
+            # Covers the per-cluster capacity rollup with an index-only scan
+            models.Index(
+                fields=["cluster", "osd_type"],
+                include=["status", "size_bytes", "used_bytes"],
+                name="netbox_osd_capacity",
+            ),
+        ]
 
     def __str__(self):
         return f"{self.name} @ {self.device}"
@@ -103,12 +208,61 @@ class CephOSD(NetBoxModel):
     def get_absolute_url(self):
         return reverse("plugins:netbox_osd:cephosd", args=[self.pk])
 
+    def clean(self):
+        super().clean()
+
+        if self.used_bytes is not None and self.size_bytes is not None and self.used_bytes > self.size_bytes:
+            raise ValidationError({"used_bytes": "Used capacity cannot exceed the OSD's size"})
+
+        # Names are parsed only for new or renamed OSDs, so legacy OSDs which
+        # migration 0005 left without an osd_id can still be edited
+        if self.name_changed:
+            self.osd_id = parse_osd_id(self.name)
+            if self.osd_id is None:
+                raise ValidationError({
+                    "name": f"OSD name must be of the form osd.<id>, e.g. osd.42, with an ID up to {OSD_ID_MAX}"
+                })
+
+        # osd_id isn't a form field, so the unique constraint isn't validated for us
+        if self.cluster_id and self.osd_id is not None:
+            duplicates = CephOSD.objects.filter(cluster=self.cluster_id, osd_id=self.osd_id).exclude(pk=self.pk)
+            if duplicates.exists():
+                raise ValidationError({"name": f"Cluster {self.cluster} already has an OSD with ID {self.osd_id}"})
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember the stored status so a change can be recorded as a
+        # CephOSDStatusTransition on save (see signals.py)
+        instance._loaded_status = instance.__dict__.get("status")
+        instance._loaded_name = instance.__dict__.get("name")
+        return instance
+
+    @property
+    def name_changed(self):
+        return self._state.adding or self.name != getattr(self, "_loaded_name", None)
+
+    def save(self, *args, **kwargs):
+        if self.name_changed:
+            self.osd_id = parse_osd_id(self.name)
+        super().save(*args, **kwargs)
+        self._loaded_name = self.name
+
     def get_status_color(self):
         return OSDStatusChoices.colors.get(self.status)
 
     def get_osd_type_color(self):
         return OSDTypeChoices.colors.get(self.osd_type)
 
+    @property
+    def utilization(self):
+        """
+        Percentage of the OSD's raw capacity in use, if known.
+        """
+        if not self.size_bytes or self.used_bytes is None:
+            return None
+        return round(self.used_bytes / self.size_bytes * 100)
+
     @property
     def rack(self):
         return self.device.rack
@@ -153,6 +307,16 @@ class CephOSDStatusNote(NetBoxModel):
         ordering = ["-created"]
         verbose_name = "OSD Status Note"
         verbose_name_plural = "OSD Status Notes"
+        indexes = [
+            models.Index(fields=["created", "id"], name="netbox_osd_note_created"),
+            models.Index(fields=["resolved", "status"], name="netbox_osd_note_res_status"),
+            models.Index(
+                fields=["osd"],
+                condition=models.Q(resolved=False),
+                name="netbox_osd_note_open",
+            ),
+            GinIndex(OpClass(Upper("reason"), name="gin_trgm_ops"), name="netbox_osd_note_reason_trgm"),
+        ]
 
     def __str__(self):
         return f"{self.osd} — {self.get_status_display()} ({self.created:%Y-%m-%d})"
@@ -162,3 +326,50 @@ class CephOSDStatusNote(NetBoxModel):
 
     def get_status_color(self):
         return NoteStatusChoices.colors.get(self.status)
+
+
+class CephOSDStatusTransition(models.Model):
+    """
+    Append-only record of a CephOSD moving from one status to another,
+    written automatically whenever an OSD's status changes.  Statuses are
+    stored as small integer codes (choices.OSD_STATUS_CODES) to keep rows
+    compact.  ``from_status`` is null when the earlier status is unknown: on
+    the row recording an OSD's creation, and on the baseline row which
+    migration 0007 seeded for each OSD that already existed.
+    """
+
+    id = models.BigAutoField(primary_key=True)
+    osd = models.ForeignKey(
+        to=CephOSD,
+        on_delete=models.CASCADE,
+        related_name="status_transitions",
+        # Covered by the (osd, ts) index
+        db_index=False,
+    )
+    from_status = models.PositiveSmallIntegerField(
+        choices=OSD_STATUS_CODE_CHOICES,
+        null=True,
+        blank=True,
+    )
+    to_status = models.PositiveSmallIntegerField(
+        choices=OSD_STATUS_CODE_CHOICES,
+    )
+    ts = models.DateTimeField(
+        verbose_name="Timestamp",
+    )
+
+    objects = RestrictedQuerySet.as_manager()
+
+    class Meta:
+        ordering = ["ts", "id"]
+        verbose_name = "OSD Status Transition"
+        verbose_name_plural = "OSD Status Transitions"
+        indexes = [
+            models.Index(fields=["osd", "ts"], name="netbox_osd_transition_osd_ts"),
+            # Rows are appended in time order, so a BRIN index serves
+            # cluster-wide date ranges at a fraction of a B-tree's size
+            BrinIndex(fields=["ts"], name="netbox_osd_transition_ts"),
+        ]
+
+    def __str__(self):
+        return f"{self.osd_id}: {self.get_from_status_display()} → {self.get_to_status_display()} ({self.ts})"
@@ -32,6 +32,11 @@ menu = PluginMenu(
                             title="Add OSD",
                             icon_class="mdi mdi-plus-thick",
                         ),
+                        PluginMenuButton(
+                            link="plugins:netbox_osd:cephosd_upsert",
+                            title="Import / update OSDs",
+                            icon_class="mdi mdi-database-sync",
+                        ),
                     ),
                 ),
                 PluginMenuItem(
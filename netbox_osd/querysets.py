@@ -0,0 +1,162 @@
+from django.db.models import Count, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from utilities.querysets import RestrictedQuerySet
+
+from .choices import OSDStatusChoices, OSDTypeChoices
+
+
+class CephClusterQuerySet(RestrictedQuerySet):
+
+    def with_counts(self):
+        """
+        Annotate each cluster with its node and OSD counts, broken down by OSD
+        status and type, using a single aggregate query.
+        """
+        return self.annotate(
+            osd_count=Count("osds"),
+            node_count=Count("osds__device", distinct=True),
+            active_count=Count("osds", filter=Q(osds__status=OSDStatusChoices.ACTIVE)),
+            down_count=Count("osds", filter=Q(osds__status=OSDStatusChoices.DOWN)),
+            out_count=Count("osds", filter=Q(osds__status=OSDStatusChoices.OUT)),
+            destroyed_count=Count("osds", filter=Q(osds__status=OSDStatusChoices.DESTROYED)),
+            hdd_count=Count("osds", filter=Q(osds__osd_type=OSDTypeChoices.HDD)),
+            ssd_count=Count("osds", filter=Q(osds__osd_type=OSDTypeChoices.SSD)),
+            nvme_count=Count("osds", filter=Q(osds__osd_type=OSDTypeChoices.NVME)),
+        )
+
+    def with_summary(self):
+        """
+        Extend with_counts() with the encrypted OSD count and the number of
+        unresolved status notes (a correlated subquery, so the note join does
+        not inflate the OSD counts).
+        """
+        from .models import CephOSDStatusNote
+
+        open_notes = (
+            CephOSDStatusNote.objects.filter(osd__cluster=OuterRef("pk"), resolved=False)
+            .order_by()
+            .values("osd__cluster")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return self.with_counts().annotate(
+            encrypted_count=Count("osds", filter=Q(osds__encrypted=True)),
+            open_note_count=Coalesce(Subquery(open_notes), 0),
+        )
+
+
+class CephOSDQuerySet(RestrictedQuerySet):
+
+    def with_open_note_count(self):
+        """
+        Annotate each OSD with ``open_note_count`` — the number of unresolved
+        status notes attached to it — using a correlated subquery, so the count
+        is computed in the same query that fetches the OSDs.
+        """
+        if "open_note_count" in self.query.annotations:
+            return self
+
+        from .models import CephOSDStatusNote
+
+        open_notes = (
+            CephOSDStatusNote.objects.filter(osd=OuterRef("pk"), resolved=False)
+            .order_by()
+            .values("osd")
+            .annotate(count=Count("pk"))
+            .values("count")
+        )
+        return self.annotate(open_note_count=Coalesce(Subquery(open_notes), 0))
+
+    def capacity_by_class(self):
+        """
+        Aggregate raw capacity per device class (``osd_type``) with a single
+        grouped query.  Destroyed OSDs are left out of ``total_bytes``;
+        ``used_bytes`` covers active OSDs only.
+        """
+        return (
+            self.order_by()
+            .values("osd_type")
+            .annotate(
+                osd_count=Count("pk"),
+                unknown_size_count=Count("pk", filter=Q(size_bytes__isnull=True)),
+                total_bytes=Sum("size_bytes", filter=~Q(status=OSDStatusChoices.DESTROYED), default=0),
+                active_bytes=Sum("size_bytes", filter=Q(status=OSDStatusChoices.ACTIVE), default=0),
+                used_bytes=Sum("used_bytes", filter=Q(status=OSDStatusChoices.ACTIVE), default=0),
+                down_bytes=Sum("size_bytes", filter=Q(status=OSDStatusChoices.DOWN), default=0),
+                out_bytes=Sum("size_bytes", filter=Q(status=OSDStatusChoices.OUT), default=0),
+            )
+            .order_by("osd_type")
+        )
+
+    def status_by_host(self):
+        """
+        Count OSDs by status per host, with each host's rack and site, in a
+        single grouped query.  Rows are ordered by site, rack and host name.
+        """
+        return (
+            self.order_by()
+            .values(
+                "device__site_id",
+                "device__site__name",
+                "device__rack_id",
+                "device__rack__name",
+                "device_id",
+                "device__name",
+            )
+            .annotate(
+                total=Count("pk"),
+                **{status: Count("pk", filter=Q(status=status)) for status in OSDStatusChoices.values()},
+            )
+            .order_by("device__site__name", "device__rack__name", "device__name")
+        )
+
+    def resolve_natural_keys(self, keys):
+        """
+        Resolve an iterable of ``(device name, OSD name)`` pairs into a
+        ``{(device name, OSD name): CephOSD}`` map using a single query.  Pairs
+        that match no OSD are absent from the returned map.
+        """
+        keys = set(keys)
+        if not keys:
+            return {}
+
+        device_names = {device_name for device_name, _ in keys}
+        osd_names = {osd_name for _, osd_name in keys}
+        osd_map = {}
+        for osd in self.filter(device__name__in=device_names, name__in=osd_names).select_related("device"):
+            key = (osd.device.name, osd.name)
+            if key in keys:
+                osd_map[key] = osd
+        return osd_map
+
+
+def cluster_nodes(cluster):
+    """
+    Return the devices hosting OSDs of `cluster`, each annotated with OSD
+    counts (by type and status) and its number of open status notes, in a
+    single grouped query.  Counts cover only the cluster's OSDs.
+    """
+    from dcim.models import Device
+    from .models import CephOSDStatusNote
+
+    open_notes = (
+        CephOSDStatusNote.objects.filter(osd__device=OuterRef("pk"), osd__cluster=cluster, resolved=False)
+        .order_by()
+        .values("osd__device")
+        .annotate(count=Count("pk"))
+        .values("count")
+    )
+    return (
+        Device.objects.filter(ceph_osds__cluster=cluster)
+        .select_related("site", "rack")
+        .annotate(
+            osd_count=Count("ceph_osds"),
+            hdd_count=Count("ceph_osds", filter=Q(ceph_osds__osd_type=OSDTypeChoices.HDD)),
+            ssd_count=Count("ceph_osds", filter=Q(ceph_osds__osd_type=OSDTypeChoices.SSD)),
+            nvme_count=Count("ceph_osds", filter=Q(ceph_osds__osd_type=OSDTypeChoices.NVME)),
+            down_count=Count("ceph_osds", filter=Q(ceph_osds__status=OSDStatusChoices.DOWN)),
+            out_count=Count("ceph_osds", filter=Q(ceph_osds__status=OSDStatusChoices.OUT)),
+            open_note_count=Coalesce(Subquery(open_notes), 0),
+        )
+        .order_by("name")
+    )
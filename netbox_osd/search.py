@@ -0,0 +1,35 @@
+from netbox.search import SearchIndex
+
+from .models import CephCluster, CephOSD, CephOSDStatusNote
+
+
+class CephClusterIndex(SearchIndex):
+    model = CephCluster
+    fields = (
+        ("name", 100),
+        ("description", 500),
+    )
+    display_attrs = ("site",)
+
+
+class CephOSDIndex(SearchIndex):
+    model = CephOSD
+    fields = (
+        ("name", 100),
+        ("device", 150),
+        ("cluster", 200),
+        ("description", 500),
+    )
+    display_attrs = ("cluster", "device", "osd_type", "status")
+
+
+class CephOSDStatusNoteIndex(SearchIndex):
+    model = CephOSDStatusNote
+    fields = (
+        ("osd", 200),
+        ("reason", 300),
+    )
+    display_attrs = ("osd", "status", "resolved")
+
+
+indexes = [CephClusterIndex, CephOSDIndex, CephOSDStatusNoteIndex]
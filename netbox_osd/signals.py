@@ -0,0 +1,88 @@
+from core.models import ObjectType
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import Signal, receiver
+from django.utils.timezone import now
+from extras.events import process_event_rules
+from extras.models import EventRule
+
+from .events import OSDS_TRANSITIONED
+from .history import record_transitions
+from .models import CephCluster, CephOSD, CephOSDStatusNote
+from .summary import invalidate_summaries
+
+# Sent once, after commit, for every bulk status transition (see
+# transitions.py) in place of per-OSD post_save events.  Receives the
+# affected OSD IDs as `osds`, plus `status`, `reason`, `user` and
+# `request_id`.
+osds_transitioned = Signal()
+
+
+@receiver((post_save, post_delete), sender=CephOSD)
+def invalidate_osd_cluster_summary(instance, **kwargs):
+    """
+    Drop the cached summary of the OSD's cluster and, if the OSD was moved,
+    of the cluster it was moved from.
+    """
+    previous = getattr(instance, "_prechange_snapshot", None) or {}
+    invalidate_summaries({instance.cluster_id, previous.get("cluster")})
+
+
+@receiver(post_save, sender=CephOSD)
+def record_osd_status_transition(instance, created, **kwargs):
+    """
+    Append a CephOSDStatusTransition when an OSD is created or its status
+    changes.
+    """
+    if created:
+        previous = None
+    elif hasattr(instance, "_loaded_status"):
+        previous = instance._loaded_status
+    else:
+        previous = (getattr(instance, "_prechange_snapshot", None) or {}).get("status", instance.status)
+    if created or previous != instance.status:
+        record_transitions([(instance.pk, previous, instance.status)], instance.last_updated or now())
+    instance._loaded_status = instance.status
+
+
+@receiver((post_save, post_delete), sender=CephOSDStatusNote)
+def invalidate_note_cluster_summary(instance, **kwargs):
+    if CephOSDStatusNote.osd.is_cached(instance):
+        cluster_id = instance.osd.cluster_id
+    else:
+        cluster_id = CephOSD.objects.filter(pk=instance.osd_id).values_list("cluster_id", flat=True).first()
+    invalidate_summaries({cluster_id})
+
+
+@receiver(post_delete, sender=CephCluster)
+def invalidate_deleted_cluster_summary(instance, **kwargs):
+    invalidate_summaries({instance.pk})
+
+
+@receiver(osds_transitioned)
+def process_osds_transitioned_event(sender, osds, status, reason, user=None, request_id=None, **kwargs):
+    """
+    Run the event rules (webhooks and scripts) subscribed to
+    ``netbox_osd.osds_transitioned`` on Ceph OSDs, once for the whole
+    transition, with a summary of it as the event data.
+    """
+    object_type = ObjectType.objects.get_for_model(CephOSD)
+    event_rules = EventRule.objects.filter(
+        enabled=True,
+        object_types=object_type,
+        event_types__contains=[OSDS_TRANSITIONED],
+    )
+    if not event_rules:
+        return
+    process_event_rules(
+        event_rules=event_rules,
+        object_type=object_type,
+        event_type=OSDS_TRANSITIONED,
+        data={
+            "osds": list(osds),
+            "count": len(osds),
+            "status": status,
+            "reason": reason,
+        },
+        username=getattr(user, "username", None),
+        request_id=request_id,
+    )
@@ -0,0 +1,180 @@
+"""
+Cached per-cluster health summaries, capacity rollups and failure-domain
+heatmaps.
+
+Each is computed with a single aggregate query and stored in NetBox's
+cache under per-cluster keys.  Signal handlers in signals.py drop a
+cluster's entries whenever one of its OSDs or status notes changes; bulk
+write paths, which bypass those signals, call invalidate_summaries()
+directly.
+"""
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.timezone import now
+from netbox.plugins import get_plugin_config
+
+CACHE_KEY = "netbox_osd:cluster_summary:{}"
+CAPACITY_CACHE_KEY = "netbox_osd:cluster_capacity:{}"
+HEATMAP_CACHE_KEY = "netbox_osd:cluster_heatmap:{}"
+
+SUMMARY_FIELDS = (
+    "node_count",
+    "osd_count",
+    "active_count",
+    "down_count",
+    "out_count",
+    "destroyed_count",
+    "hdd_count",
+    "ssd_count",
+    "nvme_count",
+    "encrypted_count",
+    "open_note_count",
+)
+
+
+def compute_summaries(cluster_ids):
+    """
+    Return a ``{cluster ID: summary}`` map computed from the database in one
+    query.
+    """
+    from .models import CephCluster
+
+    timestamp = now().isoformat()
+    return {
+        row.pop("pk"): {**row, "computed_at": timestamp}
+        for row in CephCluster.objects.filter(pk__in=cluster_ids).with_summary().values("pk", *SUMMARY_FIELDS)
+    }
+
+
+def get_summaries(cluster_ids):
+    """
+    Return a ``{cluster ID: summary}`` map, reading from the cache and
+    computing (and caching) only the entries which are missing.
+    """
+    keys = {CACHE_KEY.format(pk): pk for pk in set(cluster_ids)}
+    summaries = {keys[key]: summary for key, summary in cache.get_many(keys).items()}
+
+    if missing := [pk for pk in keys.values() if pk not in summaries]:
+        computed = compute_summaries(missing)
+        cache.set_many(
+            {CACHE_KEY.format(pk): summary for pk, summary in computed.items()},
+            timeout=get_plugin_config("netbox_osd", "summary_cache_timeout"),
+        )
+        summaries.update(computed)
+
+    return summaries
+
+
+def get_summary(cluster_id):
+    return get_summaries([cluster_id]).get(cluster_id)
+
+
+CAPACITY_FIELDS = (
+    "osd_count",
+    "unknown_size_count",
+    "total_bytes",
+    "active_bytes",
+    "used_bytes",
+    "available_bytes",
+    "down_bytes",
+    "out_bytes",
+)
+
+
+def compute_capacity(cluster_id):
+    """
+    Return the raw capacity of a cluster by device class, plus totals,
+    computed with one grouped query.  ``available_bytes`` is the capacity of
+    active OSDs not yet used.
+    """
+    from .models import CephOSD
+
+    device_classes = {}
+    for row in CephOSD.objects.filter(cluster=cluster_id).capacity_by_class():
+        row["available_bytes"] = max(row["active_bytes"] - row["used_bytes"], 0)
+        device_classes[row.pop("osd_type")] = row
+
+    return {
+        "device_classes": device_classes,
+        "total": {field: sum(row[field] for row in device_classes.values()) for field in CAPACITY_FIELDS},
+        "computed_at": now().isoformat(),
+    }
+
+
+def get_capacity(cluster_id):
+    key = CAPACITY_CACHE_KEY.format(cluster_id)
+    if (capacity := cache.get(key)) is None:
+        capacity = compute_capacity(cluster_id)
+        cache.set(key, capacity, timeout=get_plugin_config("netbox_osd", "summary_cache_timeout"))
+    return capacity
+
+
+def compute_heatmap(cluster_id):
+    """
+    Return a cluster's OSD counts by status for every site, rack and host,
+    nested in that order, from one grouped query over its hosts.  Each level
+    carries ``counts`` (``total`` plus one count per status) and ``degraded``,
+    the share of its OSDs which are down or out.  Hosts without a rack are
+    grouped under a rack with a null ``id``.
+    """
+    from .choices import OSDStatusChoices
+    from .models import CephOSD
+
+    count_fields = ("total", *OSDStatusChoices.values())
+
+    def node(pk, name):
+        return {"id": pk, "name": name, "counts": dict.fromkeys(count_fields, 0)}
+
+    sites = {}
+    for row in CephOSD.objects.filter(cluster=cluster_id).status_by_host():
+        site = sites.setdefault(row["device__site_id"], {
+            **node(row["device__site_id"], row["device__site__name"]),
+            "racks": {},
+        })
+        rack = site["racks"].setdefault(row["device__rack_id"], {
+            **node(row["device__rack_id"], row["device__rack__name"]),
+            "hosts": [],
+        })
+        host = node(row["device_id"], row["device__name"])
+        for field in count_fields:
+            host["counts"][field] = row[field]
+            rack["counts"][field] += row[field]
+            site["counts"][field] += row[field]
+        rack["hosts"].append(host)
+
+    def degraded(counts):
+        failed = counts[OSDStatusChoices.DOWN] + counts[OSDStatusChoices.OUT]
+        return round(failed / counts["total"], 4) if counts["total"] else 0
+
+    for site in sites.values():
+        site["racks"] = list(site["racks"].values())
+        for item in (site, *site["racks"], *(host for rack in site["racks"] for host in rack["hosts"])):
+            item["degraded"] = degraded(item["counts"])
+
+    return {
+        "sites": list(sites.values()),
+        "computed_at": now().isoformat(),
+    }
+
+
+def get_heatmap(cluster_id):
+    key = HEATMAP_CACHE_KEY.format(cluster_id)
+    if (heatmap := cache.get(key)) is None:
+        heatmap = compute_heatmap(cluster_id)
+        cache.set(key, heatmap, timeout=get_plugin_config("netbox_osd", "summary_cache_timeout"))
+    return heatmap
+
+
+def invalidate_summaries(cluster_ids):
+    """
+    Drop the cached summaries, capacity rollups and heatmaps of the given
+    clusters once the current transaction commits, so a concurrent request
+    cannot re-cache the pre-commit state.
+    """
+    keys = [
+        key.format(pk)
+        for pk in set(cluster_ids) if pk is not None
+        for key in (CACHE_KEY, CAPACITY_CACHE_KEY, HEATMAP_CACHE_KEY)
+    ]
+    if keys:
+        transaction.on_commit(lambda: cache.delete_many(keys))
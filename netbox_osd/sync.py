@@ -0,0 +1,176 @@
+from core.choices import ObjectChangeActionChoices
+from dcim.models import Device
+from django.db import transaction
+from django.utils.timezone import now
+from extras.models import Tag
+
+from .choices import NoteStatusChoices, OSDStatusChoices, OSDTypeChoices
+from .importers import CephOSDBulkImporter, cache_search_values, resolve_by_name
+from .models import CephOSD, CephOSDStatusNote
+from .summary import invalidate_summaries
+
+# Note status recorded when sync moves an OSD into a given state
+NOTE_STATUS_MAP = {
+    OSDStatusChoices.ACTIVE: NoteStatusChoices.RECOVERED,
+    OSDStatusChoices.DOWN: NoteStatusChoices.DOWN,
+    OSDStatusChoices.OUT: NoteStatusChoices.OUT,
+    OSDStatusChoices.DESTROYED: NoteStatusChoices.OTHER,
+}
+
+
+def parse_osd_tree(tree):
+    """
+    Parse the output of ``ceph osd tree -f json`` into a ``{osd ID: entry}``
+    map, where each entry carries the OSD's name, host and CRUSH attributes.
+    OSDs not placed under a host bucket (strays) are skipped.
+    """
+    nodes = tree.get("nodes", [])
+    hosts = {}
+    for node in nodes:
+        if node.get("type") == "host":
+            for child in node.get("children", []):
+                hosts[child] = node["name"]
+
+    osds = {}
+    for node in nodes:
+        if node.get("type") != "osd" or node["id"] not in hosts:
+            continue
+        osds[node["id"]] = {
+            "name": node["name"],
+            "host": hosts[node["id"]],
+            "device_class": node.get("device_class"),
+            "crush_weight": node.get("crush_weight"),
+            "reweight": node.get("reweight"),
+        }
+    return osds
+
+
+def parse_osd_dump(dump):
+    """
+    Parse the output of ``ceph osd dump -f json`` into a ``{osd ID: status}``
+    map of OSDStatusChoices values.
+    """
+    return {
+        osd["osd"]: derive_status(osd.get("up"), osd.get("in"), osd.get("state", []))
+        for osd in dump.get("osds", [])
+    }
+
+
+def derive_status(up, in_, state=()):
+    """
+    Map Ceph's up/in flags (and the OSD's state list) to an OSDStatusChoices
+    value.  An OSD that is out is reported as out whether or not it is up.
+    """
+    if "destroyed" in state:
+        return OSDStatusChoices.DESTROYED
+    if not in_:
+        return OSDStatusChoices.OUT
+    if not up:
+        return OSDStatusChoices.DOWN
+    return OSDStatusChoices.ACTIVE
+
+
+class CephSync:
+    """
+    Reconcile a CephCluster's OSDs with the cluster's live state.
+
+    Entries from ``ceph osd tree`` / ``ceph osd dump`` are mapped onto the
+    cluster's OSDs by numeric OSD ID and applied through
+    CephOSDBulkImporter.upsert(), so only OSDs whose state actually changed
+    are written; an OSD which moved to another host is updated in place.
+    Every status change also gets a CephOSDStatusNote.  OSDs no longer in
+    the tree are reported, not deleted.
+
+    When a `user` is given, the sync is held to that user's object
+    permissions: every OSD it creates or changes must be permitted to them,
+    both before and after the write, or PermissionsViolation is raised and
+    nothing is saved.
+    """
+
+    def __init__(self, cluster, user=None, request_id=None, chunk_size=500):
+        self.cluster = cluster
+        self.user = user
+        self.importer = CephOSDBulkImporter(user=user, request_id=request_id, chunk_size=chunk_size)
+
+    def run(self, tree, dump):
+        """
+        Apply the parsed state and return a summary of the changes made.
+        """
+        osds = parse_osd_tree(tree)
+        statuses = parse_osd_dump(dump)
+
+        devices = resolve_by_name(Device, {osd["host"] for osd in osds.values()})
+        unknown_hosts = sorted(
+            host for host in {osd["host"] for osd in osds.values()} if devices.get(host) is None
+        )
+
+        records = []
+        for osd_id, osd in osds.items():
+            if (device := devices.get(osd["host"])) is None:
+                continue
+            record = {
+                "name": osd["name"],
+                "device": device.pk,
+                "cluster": self.cluster.pk,
+                "status": statuses.get(osd_id, OSDStatusChoices.DOWN),
+            }
+            for field in ("crush_weight", "reweight"):
+                if osd[field] is not None:
+                    record[field] = osd[field]
+            if osd["device_class"] in OSDTypeChoices.values():
+                record["osd_type"] = osd["device_class"]
+            records.append(record)
+
+        with transaction.atomic():
+            if self.user is None:
+                result = self.importer.upsert(records, partial=True, match_osd_id=True)
+            else:
+                result = self.importer.upsert(
+                    records, partial=True, match_osd_id=True,
+                    permitted=CephOSD.objects.restrict(self.user, "change"),
+                )
+                self.importer.check_permitted(result["created"], CephOSD.objects.restrict(self.user, "add"))
+                self.importer.check_permitted(result["updated"], CephOSD.objects.restrict(self.user, "change"))
+            notes = self.create_status_notes(result["updated"])
+
+        missing = (
+            CephOSD.objects.filter(cluster=self.cluster)
+            .exclude(osd_id__in=list(osds))
+            .order_by("osd_id", "name")
+            .values_list("name", flat=True)
+        )
+
+        return {
+            "created": len(result["created"]),
+            "updated": len(result["updated"]),
+            "unchanged": len(result["unchanged"]),
+            "notes": len(notes),
+            "unknown_hosts": unknown_hosts,
+            "missing": list(missing),
+        }
+
+    def create_status_notes(self, osds):
+        """
+        Create a status note for every OSD whose status was changed by the sync.
+        """
+        notes = []
+        timestamp = now()
+        for osd in osds:
+            previous = osd._prechange_snapshot.get("status")
+            if previous == osd.status:
+                continue
+            notes.append(CephOSDStatusNote(
+                osd=osd,
+                status=NOTE_STATUS_MAP[osd.status],
+                reason=f"Ceph sync: status changed from {previous} to {osd.status}",
+                resolved=osd.status == OSDStatusChoices.ACTIVE,
+                resolved_at=timestamp if osd.status == OSDStatusChoices.ACTIVE else None,
+            ))
+
+        notes = CephOSDStatusNote.objects.bulk_create(notes, batch_size=self.importer.chunk_size)
+        for note in notes:
+            note._prefetched_objects_cache = {"tags": Tag.objects.none()}
+        self.importer.log_changes(notes, ObjectChangeActionChoices.ACTION_CREATE)
+        cache_search_values(notes)
+        invalidate_summaries({self.cluster.pk})
+        return notes
@@ -1,5 +1,6 @@
 import django_tables2 as tables
-from netbox.tables import NetBoxTable, ChoiceFieldColumn, TagColumn, ToggleColumn
+from django.template.defaultfilters import filesizeformat
+from netbox.tables import NetBoxTable, ChoiceFieldColumn, TagColumn, ToggleColumn, columns
 
 from .models import CephCluster, CephOSD, CephOSDStatusNote
 
@@ -10,8 +11,18 @@ class CephClusterTable(NetBoxTable):
     pk = ToggleColumn()
     name = tables.Column(linkify=True)
     site = tables.Column(linkify=True)
-    node_count = tables.Column(verbose_name="Nodes", orderable=False)
-    osd_count = tables.Column(verbose_name="OSDs", orderable=False)
+    # Count columns are backed by CephClusterQuerySet.with_summary()
+    node_count = tables.Column(verbose_name="Nodes")
+    osd_count = tables.Column(verbose_name="OSDs")
+    active_count = tables.Column(verbose_name="Active")
+    down_count = tables.Column(verbose_name="Down")
+    out_count = tables.Column(verbose_name="Out")
+    destroyed_count = tables.Column(verbose_name="Destroyed")
+    hdd_count = tables.Column(verbose_name="HDD")
+    ssd_count = tables.Column(verbose_name="SSD")
+    nvme_count = tables.Column(verbose_name="NVMe")
+    encrypted_count = tables.Column(verbose_name="Encrypted")
+    open_note_count = tables.Column(verbose_name="Open notes")
     tags = TagColumn(url_name="plugins:netbox_osd:cephcluster_list")
 
     class Meta(NetBoxTable.Meta):
@@ -22,25 +33,29 @@ class CephClusterTable(NetBoxTable):
             "site",
             "node_count",
             "osd_count",
+            "active_count",
+            "down_count",
+            "out_count",
+            "destroyed_count",
+            "hdd_count",
+            "ssd_count",
+            "nvme_count",
+            "encrypted_count",
+            "open_note_count",
             "tags",
             "created",
             "last_updated",
         )
-        default_columns = ("pk", "name", "site", "node_count", "osd_count", "tags")
-
-    def render_node_count(self, record):
-        return record.node_count
-
-    def render_osd_count(self, record):
-        return record.osd_count
+        default_columns = ("pk", "name", "site", "node_count", "osd_count", "down_count", "out_count", "tags")
 
 
 # ─── Cluster → Nodes (Device) sub-table ──────────────────────────────────────
 
 class ClusterNodeTable(tables.Table):
     """
-    Simple table of Devices (nodes) within a cluster, annotated with OSD counts.
-    Not a NetBoxTable — just a display table, no bulk actions needed.
+    Devices (nodes) within a cluster, annotated with per-node OSD counts by
+    querysets.cluster_nodes().  Not a NetBoxTable — just a display table, no
+    bulk actions needed.
     """
 
     name = tables.Column(
@@ -50,16 +65,35 @@ class ClusterNodeTable(tables.Table):
     site = tables.Column(
         accessor="site",
         linkify=lambda record: record.site.get_absolute_url() if record.site else None,
+        order_by=("site__name",),
     )
     rack = tables.Column(
         accessor="rack",
         linkify=lambda record: record.rack.get_absolute_url() if record.rack else None,
+        order_by=("rack__name",),
     )
-    osd_count = tables.Column(verbose_name="OSDs", orderable=False)
+    osd_count = tables.Column(verbose_name="OSDs")
+    hdd_count = tables.Column(verbose_name="HDD")
+    ssd_count = tables.Column(verbose_name="SSD")
+    nvme_count = tables.Column(verbose_name="NVMe")
+    down_count = tables.Column(verbose_name="Down")
+    out_count = tables.Column(verbose_name="Out")
+    open_note_count = tables.Column(verbose_name="Open notes")
 
     class Meta:
         attrs = {"class": "table table-hover table-headings"}
-        sequence = ("name", "site", "rack", "osd_count")
+        sequence = (
+            "name",
+            "site",
+            "rack",
+            "osd_count",
+            "hdd_count",
+            "ssd_count",
+            "nvme_count",
+            "down_count",
+            "out_count",
+            "open_note_count",
+        )
         empty_text = "No nodes in this cluster."
 
 
@@ -67,7 +101,9 @@ class ClusterNodeTable(tables.Table):
 
 class CephOSDTable(NetBoxTable):
     pk = ToggleColumn()
-    name = tables.Column(linkify=True)
+    # Sort by the numeric OSD ID so osd.2 comes before osd.10
+    name = tables.Column(linkify=True, order_by=("osd_id", "name"))
+    osd_id = tables.Column(verbose_name="OSD ID")
     cluster = tables.Column(linkify=True)
     device = tables.Column(linkify=True)
     rack = tables.Column(
@@ -83,7 +119,16 @@ class CephOSDTable(NetBoxTable):
     osd_type = ChoiceFieldColumn(verbose_name="Type")
     encrypted = tables.BooleanColumn()
     status = ChoiceFieldColumn()
-    open_notes = tables.Column(verbose_name="Open notes", orderable=False, empty_values=())
+    size_bytes = tables.Column(verbose_name="Size")
+    used_bytes = tables.Column(verbose_name="Used")
+    utilization = columns.UtilizationColumn(orderable=False)
+    crush_weight = tables.Column(verbose_name="CRUSH weight")
+    reweight = tables.Column()
+    open_notes = tables.Column(
+        accessor="open_note_count",
+        verbose_name="Open notes",
+        order_by=("open_note_count",),
+    )
     tags = TagColumn(url_name="plugins:netbox_osd:cephosd_list")
 
     class Meta(NetBoxTable.Meta):
@@ -91,6 +136,7 @@ class CephOSDTable(NetBoxTable):
         fields = (
             "pk",
             "name",
+            "osd_id",
             "cluster",
             "device",
             "rack",
@@ -98,6 +144,11 @@ class CephOSDTable(NetBoxTable):
             "osd_type",
             "encrypted",
             "status",
+            "size_bytes",
+            "used_bytes",
+            "utilization",
+            "crush_weight",
+            "reweight",
             "open_notes",
             "tags",
             "created",
@@ -116,9 +167,15 @@ class CephOSDTable(NetBoxTable):
             "open_notes",
         )
 
-    def render_open_notes(self, record):
-        count = record.status_notes.filter(resolved=False).count()
-        return count or "—"
+    def render_size_bytes(self, value):
+        return filesizeformat(value)
+
+    def render_used_bytes(self, value):
+        return filesizeformat(value)
+
+    def render_open_notes(self, value):
+        # Backed by CephOSDQuerySet.with_open_note_count()
+        return value or "—"
 
 
 # ─── CephOSDStatusNote ────────────────────────────────────────────────────────
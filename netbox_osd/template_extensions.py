@@ -1,24 +1,39 @@
+from django.db.models import Count, Q
 from netbox.plugins import PluginTemplateExtension
 
+from .choices import OSDStatusChoices
+from .instrumentation import instrumented
 from .models import CephOSD
-from .tables import CephOSDTable
 
 
 class DeviceCephOSDPanel(PluginTemplateExtension):
-    """Adds a Ceph OSDs panel to the Device detail page."""
+    """
+    Adds a Ceph OSDs panel to the Device detail page.  Only the status counts
+    are rendered inline; the OSD table itself is loaded via HTMX from the
+    paginated OSD list view, so the Device page costs the same whatever the
+    number of OSDs.
+    """
 
     models = ["dcim.device"]
 
+    @instrumented("DeviceCephOSDPanel")
     def full_width_page(self):
         device = self.context["object"]
-        osds = CephOSD.objects.filter(device=device).prefetch_related("tags")
-        table = CephOSDTable(osds, orderable=False)
-        table.configure(self.context["request"])
-
+        osds = CephOSD.objects.restrict(self.context["request"].user, "view").filter(device=device)
+        if not osds.exists():
+            return ""
+
+        counts = osds.aggregate(
+            total=Count("pk"),
+            **{
+                status: Count("pk", filter=Q(status=status))
+                for status in (OSDStatusChoices.ACTIVE, OSDStatusChoices.DOWN, OSDStatusChoices.OUT)
+            },
+        )
         return self.render(
             "netbox_osd/inc/device_osd_panel.html",
             extra_context={
-                "osds_table": table,
+                "counts": counts,
                 "device": device,
             },
         )
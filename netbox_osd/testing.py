@@ -0,0 +1,65 @@
+"""
+Test helpers for enforcing SQL query budgets on the plugin's views and API
+endpoints, so that N+1 regressions fail CI.
+
+    from utilities.testing import TestCase
+    from netbox_osd.testing import QueryBudgetMixin
+
+    class OSDListQueryTest(QueryBudgetMixin, TestCase):
+
+        def test_osd_list(self):
+            self.assertViewQueryBudget("plugins:netbox_osd:cephosd_list", 12)
+
+        def test_osd_api_list(self):
+            with self.assertQueryBudget(8):
+                self.client.get("/api/plugins/osd/osds/?limit=1000")
+
+A budget holds whatever the number of rows, so create enough objects (more
+than one page's worth of related rows) for per-row queries to exceed it.
+"""
+from contextlib import contextmanager
+
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+@contextmanager
+def query_budget(budget, using=DEFAULT_DB_ALIAS):
+    """
+    Fail with QueryBudgetExceeded, listing the queries run, if the enclosed
+    block runs more than `budget` SQL queries.
+    """
+    with CaptureQueriesContext(connections[using]) as captured:
+        yield captured
+    if len(captured) > budget:
+        queries = "\n".join(f"{i}. {query['sql']}" for i, query in enumerate(captured.captured_queries, start=1))
+        raise QueryBudgetExceeded(f"{len(captured)} queries run, budget is {budget}:\n{queries}")
+
+
+class QueryBudgetMixin:
+    """
+    TestCase mixin adding query budget assertions.
+    """
+
+    def assertQueryBudget(self, budget, using=DEFAULT_DB_ALIAS):
+        return query_budget(budget, using=using)
+
+    def assertViewQueryBudget(self, view_name, budget, *, args=None, kwargs=None, data=None, status_code=200,
+                              **headers):
+        """
+        GET the view `view_name` with `data` as query parameters and assert
+        that it responds with `status_code` within `budget` queries.
+        """
+        url = reverse(view_name, args=args, kwargs=kwargs)
+        with query_budget(budget):
+            response = self.client.get(url, data, **headers)
+            if response.streaming:
+                for _ in response.streaming_content:
+                    pass
+        self.assertEqual(response.status_code, status_code)
+        return response
@@ -0,0 +1,58 @@
+import io
+from unittest import mock
+
+from core.models import ObjectType
+from django.core.management import call_command
+from django.test import TestCase
+from extras.choices import EventRuleActionChoices
+from extras.models import EventRule, Webhook
+
+from netbox_osd.choices import OSDStatusChoices
+from netbox_osd.events import OSDS_TRANSITIONED
+from netbox_osd.models import CephOSD
+from netbox_osd.transitions import CephOSDTransition
+
+
+class OSDsTransitionedEventTest(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        call_command(
+            "seed_ceph_osds", prefix="events", racks_per_site=2, hosts_per_rack=2, osds_per_host=3,
+            stdout=io.StringIO(),
+        )
+        webhook = Webhook.objects.create(name="OSD transitions", payload_url="http://localhost/")
+        event_rule = EventRule.objects.create(
+            name="OSD transitions",
+            event_types=[OSDS_TRANSITIONED],
+            action_type=EventRuleActionChoices.WEBHOOK,
+            action_object_type=ObjectType.objects.get_for_model(Webhook),
+            action_object_id=webhook.pk,
+        )
+        event_rule.object_types.set([ObjectType.objects.get_for_model(CephOSD)])
+
+    @mock.patch("extras.events.get_queue")
+    def test_webhook_enqueued_once_per_transition(self, get_queue):
+        osds = CephOSD.objects.exclude(status=OSDStatusChoices.OUT)
+        osd_ids = sorted(osds.values_list("pk", flat=True))
+        self.assertGreater(len(osd_ids), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CephOSDTransition().run(osds, OSDStatusChoices.OUT, "Rack power loss")
+
+        get_queue.return_value.enqueue.assert_called_once()
+        params = get_queue.return_value.enqueue.call_args.kwargs
+        self.assertEqual(params["event_type"], OSDS_TRANSITIONED)
+        self.assertEqual(sorted(params["data"]["osds"]), osd_ids)
+        self.assertEqual(params["data"]["count"], len(osd_ids))
+        self.assertEqual(params["data"]["status"], OSDStatusChoices.OUT)
+        self.assertEqual(params["data"]["reason"], "Rack power loss")
+
+    @mock.patch("extras.events.get_queue")
+    def test_no_event_without_changes(self, get_queue):
+        osds = CephOSD.objects.filter(status=OSDStatusChoices.OUT)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            CephOSDTransition().run(osds, OSDStatusChoices.OUT)
+
+        get_queue.return_value.enqueue.assert_not_called()
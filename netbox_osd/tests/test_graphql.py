@@ -0,0 +1,71 @@
+import io
+import json
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from netbox_osd.models import CephOSD, CephOSDStatusNote
+
+# Walks all three levels of the plugin's types: clusters -> OSDs -> notes
+CLUSTER_TREE_QUERY = """
+{
+  ceph_cluster_list {
+    id
+    name
+    osds {
+      id
+      name
+      status
+      device { id name }
+      status_notes { id status reason }
+    }
+  }
+}
+"""
+
+
+class GraphQLQueryCountTest(TestCase):
+    """
+    Nested list queries must run a fixed number of SQL queries, however many
+    clusters, OSDs and notes they return.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = get_user_model().objects.create(username="graphql", is_superuser=True)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def seed(self, prefix, **options):
+        call_command("seed_ceph_osds", prefix=prefix, notes_per_osd=2, stdout=io.StringIO(), **options)
+
+    def run_query(self):
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.post(
+                reverse("graphql"), json.dumps({"query": CLUSTER_TREE_QUERY}), content_type="application/json"
+            )
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertNotIn("errors", data)
+        return data["data"]["ceph_cluster_list"], len(captured)
+
+    def test_cluster_tree_query_count_is_constant(self):
+        self.seed("gqlsmall", racks_per_site=1, hosts_per_rack=2, osds_per_host=2)
+        small, small_queries = self.run_query()
+        self.assertEqual(sum(len(cluster["osds"]) for cluster in small), 4)
+
+        self.seed("gqllarge", racks_per_site=3, hosts_per_rack=4, osds_per_host=6, clusters=2)
+        large, large_queries = self.run_query()
+        self.assertEqual(len(large), 3)
+        self.assertEqual(sum(len(cluster["osds"]) for cluster in large), CephOSD.objects.count())
+        self.assertEqual(
+            sum(len(osd["status_notes"]) for cluster in large for osd in cluster["osds"]),
+            CephOSDStatusNote.objects.count(),
+        )
+
+        self.assertEqual(small_queries, large_queries)
@@ -0,0 +1,40 @@
+import time
+
+from django.template.base import Context, Template
+from django.test import SimpleTestCase
+
+from netbox_osd.instrumentation import _time_template_render, measure, rendering, server_timing
+
+
+class RenderTimeTest(SimpleTestCase):
+
+    def test_rendering_counts_toward_open_scopes(self):
+        with measure("outer") as outer:
+            with measure("inner") as inner:
+                with rendering():
+                    time.sleep(0.01)
+            time.sleep(0.01)
+        self.assertGreaterEqual(inner.render_time, 0.01)
+        self.assertAlmostEqual(outer.render_time, inner.render_time)
+        self.assertLess(outer.render_time, outer.duration)
+
+    def test_nested_rendering_counted_once(self):
+        with measure("scope") as measurement:
+            with rendering():
+                with rendering():
+                    time.sleep(0.01)
+        self.assertLess(measurement.render_time, 0.02)
+
+    def test_template_render_timed(self):
+        render = _time_template_render(Template.render)
+        with measure("scope") as measurement:
+            self.assertEqual(render(Template("{{ value }}"), Context({"value": "x"})), "x")
+        self.assertGreater(measurement.render_time, 0)
+
+    def test_server_timing(self):
+        with measure("scope") as measurement:
+            pass
+        self.assertEqual(
+            [metric.split(";")[0] for metric in server_timing([measurement]).split(", ")],
+            ["db0", "render0", "total0"],
+        )
@@ -0,0 +1,60 @@
+import io
+
+from dcim.models import Device
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+
+from netbox_osd.template_extensions import DeviceCephOSDPanel
+from netbox_osd.testing import QueryBudgetMixin
+
+# Rows per page for the list views; more rows than any budget, so one query
+# per row cannot fit
+PER_PAGE = 100
+
+
+class QueryBudgetTest(QueryBudgetMixin, TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        # 40 clusters over 120 hosts with 3 OSDs each, plus open status notes
+        call_command(
+            "seed_ceph_osds", prefix="budget", racks_per_site=6, hosts_per_rack=20, osds_per_host=3,
+            clusters=40, notes_per_osd=2, stdout=io.StringIO(),
+        )
+        cls.user = get_user_model().objects.create(username="budget", is_superuser=True)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_osd_list(self):
+        # Open note counts are annotated (with_open_note_count), not queried per row
+        response = self.assertViewQueryBudget(
+            "plugins:netbox_osd:cephosd_list", 30, data={"per_page": PER_PAGE}
+        )
+        self.assertEqual(len(response.context["table"].page.object_list), PER_PAGE)
+
+    def test_osd_list_embedded(self):
+        device = Device.objects.filter(name__startswith="budget-").first()
+        self.assertViewQueryBudget(
+            "plugins:netbox_osd:cephosd_list", 20, data={"device_id": device.pk, "embedded": "true"},
+            HTTP_HX_REQUEST="true",
+        )
+
+    def test_cluster_list(self):
+        # Counts are annotated by with_summary(), not read per row
+        response = self.assertViewQueryBudget(
+            "plugins:netbox_osd:cephcluster_list", 30, data={"per_page": PER_PAGE}
+        )
+        self.assertEqual(len(response.context["table"].page.object_list), 40)
+
+    def test_device_panel(self):
+        device = Device.objects.filter(name__startswith="budget-").first()
+        request = RequestFactory().get(device.get_absolute_url())
+        request.user = self.user
+        panel = DeviceCephOSDPanel({"object": device, "request": request})
+
+        # One existence check and one aggregate, however many OSDs the device has
+        with self.assertQueryBudget(2):
+            html = panel.full_width_page()
+        self.assertIn("Ceph OSDs", html)
@@ -0,0 +1,104 @@
+import uuid
+
+from core.choices import ObjectChangeActionChoices
+from django.db import transaction
+from django.utils.timezone import now
+from extras.models import Tag
+
+from .choices import OSDStatusChoices
+from .history import record_transitions
+from .importers import CephOSDBulkImporter, cache_search_values
+from .models import CephOSD, CephOSDStatusNote
+from .signals import osds_transitioned
+from .summary import invalidate_summaries
+from .sync import NOTE_STATUS_MAP
+
+
+class CephOSDTransition:
+    """
+    Move a set of OSDs to a new status in one transaction.
+
+    The matching rows are locked and updated with set-based UPDATEs, one
+    status note is bulk-created per OSD, and the ObjectChanges for both are
+    bulk-inserted.  No per-object save signals are sent; instead a single
+    ``osds_transitioned`` signal fires once the transaction commits.
+    """
+
+    def __init__(self, user=None, request_id=None, chunk_size=500):
+        self.user = user
+        self.request_id = request_id or uuid.uuid4()
+        self.chunk_size = chunk_size
+        # Reuse the importer's bulk ObjectChange writer
+        self.changelog = CephOSDBulkImporter(user=user, request_id=self.request_id, chunk_size=chunk_size)
+
+    def run(self, queryset, status, reason=""):
+        """
+        Transition every OSD in `queryset` not already in `status`.  Returns
+        a dict of the ``updated`` OSDs, the ``unchanged`` count and the
+        created ``notes``.
+        """
+        with transaction.atomic():
+            # Lock the rows through a plain pk subquery; the filtered queryset
+            # may carry joins or DISTINCT, which FOR UPDATE does not allow.
+            osds = list(
+                CephOSD.objects.filter(pk__in=queryset.exclude(status=status).values("pk"))
+                .exclude(status=status)
+                .select_for_update()
+                .prefetch_related("tags")
+                .order_by("pk")
+            )
+            unchanged = queryset.filter(status=status).count()
+
+            timestamp = now()
+            for start in range(0, len(osds), self.chunk_size):
+                chunk = osds[start:start + self.chunk_size]
+                for osd in chunk:
+                    osd.snapshot()
+                    osd.status = status
+                    osd.last_updated = timestamp
+                CephOSD.objects.filter(pk__in=[osd.pk for osd in chunk]).update(
+                    status=status,
+                    last_updated=timestamp,
+                )
+                self.changelog.log_changes(chunk, ObjectChangeActionChoices.ACTION_UPDATE)
+                record_transitions(
+                    [(osd.pk, osd._prechange_snapshot["status"], status) for osd in chunk],
+                    timestamp,
+                )
+
+            notes = self.create_notes(osds, status, reason, timestamp)
+            invalidate_summaries({osd.cluster_id for osd in osds})
+
+            if osds:
+                osd_ids = [osd.pk for osd in osds]
+                transaction.on_commit(lambda: osds_transitioned.send(
+                    sender=CephOSD,
+                    osds=osd_ids,
+                    status=status,
+                    reason=reason,
+                    user=self.user,
+                    request_id=self.request_id,
+                ))
+
+        return {"updated": osds, "unchanged": unchanged, "notes": notes}
+
+    def create_notes(self, osds, status, reason, timestamp):
+        resolved = status == OSDStatusChoices.ACTIVE
+        notes = CephOSDStatusNote.objects.bulk_create(
+            [
+                CephOSDStatusNote(
+                    osd=osd,
+                    status=NOTE_STATUS_MAP[status],
+                    reason=reason or f"Status changed from {osd._prechange_snapshot['status']} to {status}",
+                    resolved=resolved,
+                    resolved_at=timestamp if resolved else None,
+                )
+                for osd in osds
+            ],
+            batch_size=self.chunk_size,
+        )
+        for note in notes:
+            note._prefetched_objects_cache = {"tags": Tag.objects.none()}
+        self.changelog.log_changes(notes, ObjectChangeActionChoices.ACTION_CREATE)
+        cache_search_values(notes)
+        return notes
@@ -11,6 +11,7 @@ urlpatterns = [
     path("clusters/import/", views.CephClusterImportView.as_view(), name="cephcluster_import"),
     path("clusters/delete/", views.CephClusterBulkDeleteView.as_view(), name="cephcluster_bulk_delete"),
     path("clusters/<int:pk>/", views.CephClusterView.as_view(), name="cephcluster"),
+    path("clusters/<int:pk>/heatmap/", views.CephClusterHeatmapView.as_view(), name="cephcluster_heatmap"),
     path("clusters/<int:pk>/edit/", views.CephClusterEditView.as_view(), name="cephcluster_edit"),
     path("clusters/<int:pk>/delete/", views.CephClusterDeleteView.as_view(), name="cephcluster_delete"),
     path(
@@ -24,6 +25,7 @@ urlpatterns = [
     path("osds/", views.CephOSDListView.as_view(), name="cephosd_list"),
     path("osds/add/", views.CephOSDEditView.as_view(), name="cephosd_add"),
     path("osds/import/", views.CephOSDImportView.as_view(), name="cephosd_import"),
+    path("osds/upsert/", views.CephOSDUpsertImportView.as_view(), name="cephosd_upsert"),
     path("osds/delete/", views.CephOSDBulkDeleteView.as_view(), name="cephosd_bulk_delete"),
     path("osds/edit/", views.CephOSDBulkEditView.as_view(), name="cephosd_bulk_edit"),
     path("osds/<int:pk>/", views.CephOSDView.as_view(), name="cephosd"),
@@ -50,4 +52,7 @@ urlpatterns = [
         name="cephosdsstatusnote_changelog",
         kwargs={"model": CephOSDStatusNote},
     ),
+
+    # ── Background jobs ───────────────────────────────────────────────────────
+    path("jobs/<int:pk>/report/", views.CephJobReportView.as_view(), name="job_report"),
 ]
@@ -1,8 +1,19 @@
-from django.db.models import Count
+import csv
+from functools import partial
+
+from core.models import Job
+from django.contrib import messages
+from django.core.exceptions import ValidationError
+from django.http import HttpResponse
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from django.utils.html import format_html
+from django.views.generic import View
 from django_tables2 import RequestConfig
+from netbox.plugins import get_plugin_config
 from netbox.views import generic
-from utilities.views import register_model_view
-from dcim.models import Device
+from utilities.exceptions import PermissionsViolation
+from utilities.views import ConditionalLoginRequiredMixin, ViewTab, register_model_view
 
 from .filtersets import CephClusterFilterSet, CephOSDFilterSet, CephOSDStatusNoteFilterSet
 from .forms import (
@@ -17,8 +28,34 @@ from .forms import (
     CephOSDStatusNoteFilterForm,
     CephOSDStatusNoteImportForm,
 )
+from .importers import CephOSDBulkImporter
+from .jobs import BULK_JOBS, CephOSDBulkEditJob, CephOSDImportJob, CephOSDStatusNoteImportJob
 from .models import CephCluster, CephOSD, CephOSDStatusNote
+from .querysets import cluster_nodes
+from .summary import get_heatmap
 from .tables import CephClusterTable, ClusterNodeTable, CephOSDTable, CephOSDStatusNoteTable
+from .transitions import CephOSDTransition
+
+
+def run_in_background(count):
+    """
+    Return True if an operation on `count` rows should be handed to a
+    background job rather than run in the web request.
+    """
+    threshold = get_plugin_config("netbox_osd", "background_job_threshold")
+    return threshold is not None and count >= threshold
+
+
+def enqueue_bulk_job(request, job_class, **kwargs):
+    job = job_class.enqueue(user=request.user, **kwargs)
+    messages.info(request, format_html(
+        'Queued as background job <a href="{}">{}</a>. Its error report can be downloaded '
+        '<a href="{}">here</a> once it has finished.',
+        job.get_absolute_url(),
+        job,
+        reverse("plugins:netbox_osd:job_report", args=[job.pk]),
+    ))
+    return job
 
 
 # ─── CephCluster ──────────────────────────────────────────────────────────────
@@ -28,29 +65,42 @@ class CephClusterView(generic.ObjectView):
     queryset = CephCluster.objects.prefetch_related("tags")
 
     def get_extra_context(self, request, instance):
-        # Nodes: distinct devices that have OSDs in this cluster, annotated with count
-        nodes_qs = (
-            Device.objects.filter(ceph_osds__cluster=instance)
-            .annotate(osd_count=Count("ceph_osds"))
-            .distinct()
-        )
-        nodes_table = ClusterNodeTable(nodes_qs)
-        RequestConfig(request).configure(nodes_table)
+        # Nodes: devices hosting this cluster's OSDs, with per-node counts. The
+        # prefix keeps its sort/page parameters apart from the OSD table's.
+        nodes_table = ClusterNodeTable(cluster_nodes(instance), prefix="nodes_")
+        RequestConfig(request, paginate={"per_page": 50}).configure(nodes_table)
 
         # OSDs in this cluster
-        osds_qs = instance.osds.prefetch_related("device__rack", "device__site", "tags")
+        osds_qs = instance.osds.with_open_note_count().prefetch_related("device__rack", "device__site", "tags")
         osds_table = CephOSDTable(osds_qs, orderable=True)
         osds_table.configure(request)
 
         return {
+            "summary": instance.summary,
             "nodes_table": nodes_table,
             "osds_table": osds_table,
         }
 
 
+@register_model_view(CephCluster, "heatmap")
+class CephClusterHeatmapView(generic.ObjectView):
+    """
+    OSD status counts for every rack and host of the cluster, from the cached
+    heatmap.
+    """
+    queryset = CephCluster.objects.all()
+    template_name = "netbox_osd/cephcluster_heatmap.html"
+    tab = ViewTab(label="Heatmap", weight=500)
+
+    def get_extra_context(self, request, instance):
+        return {
+            "heatmap": get_heatmap(instance.pk),
+        }
+
+
 @register_model_view(CephCluster, "list", path="")
 class CephClusterListView(generic.ObjectListView):
-    queryset = CephCluster.objects.prefetch_related("tags")
+    queryset = CephCluster.objects.with_summary().prefetch_related("site", "tags")
     table = CephClusterTable
     filterset = CephClusterFilterSet
     filterset_form = CephClusterFilterForm
@@ -70,7 +120,7 @@ class CephClusterDeleteView(generic.ObjectDeleteView):
 
 @register_model_view(CephCluster, "bulk_delete")
 class CephClusterBulkDeleteView(generic.BulkDeleteView):
-    queryset = CephCluster.objects.all()
+    queryset = CephCluster.objects.with_summary().prefetch_related("site", "tags")
     filterset = CephClusterFilterSet
     table = CephClusterTable
 
@@ -98,7 +148,9 @@ class CephOSDView(generic.ObjectView):
 
 @register_model_view(CephOSD, "list", path="")
 class CephOSDListView(generic.ObjectListView):
-    queryset = CephOSD.objects.prefetch_related("cluster", "device__rack", "device__site", "tags")
+    queryset = CephOSD.objects.with_open_note_count().prefetch_related(
+        "cluster", "device__rack", "device__site", "tags"
+    )
     table = CephOSDTable
     filterset = CephOSDFilterSet
     filterset_form = CephOSDFilterForm
@@ -118,15 +170,64 @@ class CephOSDDeleteView(generic.ObjectDeleteView):
 
 @register_model_view(CephOSD, "bulk_edit")
 class CephOSDBulkEditView(generic.BulkEditView):
-    queryset = CephOSD.objects.prefetch_related("tags")
+    queryset = CephOSD.objects.with_open_note_count().prefetch_related(
+        "cluster", "device__rack", "device__site", "tags"
+    )
     filterset = CephOSDFilterSet
     table = CephOSDTable
     form = CephOSDBulkEditForm
+    model_fields = ("cluster", "osd_type", "status", "encrypted")
+
+    def _update_objects(self, form, request):
+        data = form.cleaned_data
+        nullify = [field for field in request.POST.getlist("_nullify") if field in form.nullable_fields]
+        changes = {field: data[field] for field in self.model_fields if self._is_set(data.get(field))}
+        tags = {field: [tag.pk for tag in data.get(field) or []] for field in ("add_tags", "remove_tags")}
+        custom_fields = [name for name, value in data.items() if name.startswith("cf_") and self._is_set(value)]
+        # A status-only change is applied as a bulk transition: one UPDATE,
+        # a status note per OSD and a single osds_transitioned signal.  Users
+        # who may not add status notes get a plain update instead.
+        status_only = (
+            set(changes) == {"status"}
+            and not (nullify or custom_fields or any(tags.values()))
+            and request.user.has_perm("netbox_osd.add_cephosdstatusnote")
+        )
+
+        queryset = self.queryset.filter(pk__in=data["pk"])
+        # Custom field edits are only applied in the request
+        if run_in_background(len(data["pk"])) and not custom_fields:
+            if "cluster" in changes:
+                changes["cluster"] = changes["cluster"].pk
+            enqueue_bulk_job(
+                request,
+                CephOSDBulkEditJob,
+                pks=list(queryset.values_list("pk", flat=True)),
+                changes=changes,
+                nullify=nullify,
+                reason=data["reason"],
+                **tags,
+            )
+            return []
+
+        if not status_only:
+            return super()._update_objects(form, request)
+
+        transition = CephOSDTransition(user=request.user, request_id=request.id)
+        result = transition.run(queryset, data["status"], data["reason"])
+        return result["updated"]
+
+    @staticmethod
+    def _is_set(value):
+        if hasattr(value, "exists"):
+            return value.exists()
+        return value not in (None, "", [])
 
 
 @register_model_view(CephOSD, "bulk_delete")
 class CephOSDBulkDeleteView(generic.BulkDeleteView):
-    queryset = CephOSD.objects.all()
+    queryset = CephOSD.objects.with_open_note_count().prefetch_related(
+        "cluster", "device__rack", "device__site", "tags"
+    )
     filterset = CephOSDFilterSet
     table = CephOSDTable
 
@@ -136,6 +237,73 @@ class CephOSDImportView(generic.BulkImportView):
     queryset = CephOSD.objects.all()
     model_form = CephOSDImportForm
 
+    def create_and_update_objects(self, form, request):
+        records = form.cleaned_data["data"]
+        threshold = get_plugin_config("netbox_osd", "bulk_import_threshold")
+        # The bulk importer cannot fill in required custom fields without a default
+        if (
+            len(records) < threshold
+            or not CephOSDBulkImporter.supports(records)
+            or CephOSDBulkImporter.required_custom_fields()
+        ):
+            return super().create_and_update_objects(form, request)
+
+        if run_in_background(len(records)):
+            enqueue_bulk_job(request, CephOSDImportJob, records=records)
+            return []
+
+        importer = CephOSDBulkImporter(user=request.user, request_id=request.id)
+        try:
+            return importer.create(records)
+        except ValidationError as e:
+            for message in e.messages:
+                form.add_error(None, message)
+            raise ValidationError("")
+
+
+@register_model_view(CephOSD, "upsert")
+class CephOSDUpsertImportView(CephOSDImportView):
+    """
+    Import OSDs keyed on (device, name): existing OSDs are updated in place
+    (only when a field actually differs) and unknown ones are created, so a
+    nightly inventory can be re-imported without duplicates.  Columns omitted
+    from the upload are left unchanged on existing OSDs.
+    """
+
+    def create_and_update_objects(self, form, request):
+        if not request.user.has_perm("netbox_osd.change_cephosd"):
+            raise PermissionsViolation
+
+        records = form.cleaned_data["data"]
+        if not CephOSDBulkImporter.supports(records):
+            form.add_error(None, "Upsert imports support only these columns: " + ", ".join(
+                CephOSDBulkImporter.fields
+            ))
+            raise ValidationError("")
+
+        if run_in_background(len(records)):
+            enqueue_bulk_job(request, CephOSDImportJob, records=records, upsert=True)
+            return []
+
+        importer = CephOSDBulkImporter(user=request.user, request_id=request.id)
+        try:
+            result = importer.upsert(
+                records,
+                partial=True,
+                permitted=CephOSD.objects.restrict(request.user, "change"),
+            )
+        except ValidationError as e:
+            for message in e.messages:
+                form.add_error(None, message)
+            raise ValidationError("")
+
+        messages.info(
+            request,
+            f"Created {len(result['created'])}, updated {len(result['updated'])}, "
+            f"unchanged {len(result['unchanged'])} OSDs",
+        )
+        return result["created"] + result["updated"]
+
 
 # ─── CephOSDStatusNote ────────────────────────────────────────────────────────
 
@@ -175,3 +343,49 @@ class CephOSDStatusNoteBulkDeleteView(generic.BulkDeleteView):
 class CephOSDStatusNoteImportView(generic.BulkImportView):
     queryset = CephOSDStatusNote.objects.all()
     model_form = CephOSDStatusNoteImportForm
+
+    def create_and_update_objects(self, form, request):
+        if run_in_background(len(form.cleaned_data["data"])):
+            enqueue_bulk_job(request, CephOSDStatusNoteImportJob, records=form.cleaned_data["data"])
+            return []
+
+        # Resolve every (osd_device, osd_name) pair in the upload with one query
+        # and report all unknown OSDs at once, rather than failing row by row.
+        # OSDs the user may not view are reported as unknown.
+        keys = {
+            (record["osd_device"], record["osd_name"])
+            for record in form.cleaned_data["data"]
+            if record.get("osd_device") and record.get("osd_name")
+        }
+        osd_map = CephOSD.objects.restrict(request.user, "view").resolve_natural_keys(keys)
+        if missing := sorted(keys - osd_map.keys()):
+            form.add_error(None, "Unknown OSDs: " + ", ".join(
+                f"{osd_name} on {device_name}" for device_name, osd_name in missing
+            ))
+            raise ValidationError("")
+
+        self.model_form = partial(CephOSDStatusNoteImportForm, osd_map=osd_map)
+        return super().create_and_update_objects(form, request)
+
+
+# ─── Background jobs ──────────────────────────────────────────────────────────
+
+class CephJobReportView(ConditionalLoginRequiredMixin, View):
+    """
+    Download the errors recorded by a background import or bulk edit job as
+    CSV.
+    """
+
+    def get(self, request, pk):
+        job = get_object_or_404(
+            Job.objects.restrict(request.user, "view"),
+            pk=pk,
+            name__in=[job_class.name for job_class in BULK_JOBS],
+        )
+        response = HttpResponse(content_type="text/csv; charset=utf-8")
+        response["Content-Disposition"] = f'attachment; filename="ceph-job-{job.pk}-errors.csv"'
+        writer = csv.writer(response)
+        writer.writerow(["error"])
+        for error in (job.data or {}).get("errors", []):
+            writer.writerow([error])
+        return response
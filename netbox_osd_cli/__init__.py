@@ -0,0 +1,6 @@
+"""
+Command-line client for the netbox_osd plugin's REST API.
+
+Kept separate from the plugin package so it can be installed and run on hosts
+without NetBox: pip install "netbox-osd-plugin[cli]".
+"""
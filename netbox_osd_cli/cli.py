@@ -0,0 +1,155 @@
+import argparse
+import os
+import sys
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import islice
+
+import requests
+
+from .client import NetBoxClient
+from .inventory import InventoryReader
+
+
+def batched(iterable, size):
+    iterator = iter(iterable)
+    while batch := list(islice(iterator, size)):
+        yield batch
+
+
+CAPACITY_FIELDS = ("size_bytes", "used_bytes", "crush_weight", "reweight")
+
+
+def build_payload(osds, cluster_id, device_ids):
+    """
+    Convert inventory entries into API records, skipping OSDs whose device
+    could not be resolved.
+    """
+    payload = []
+    for osd in osds:
+        device_id = device_ids.get(osd["device"])
+        if device_id is None:
+            continue
+        record = {
+            "name": osd["name"],
+            "cluster": cluster_id,
+            "device": device_id,
+            "osd_type": osd.get("osd_type", "hdd"),
+            "encrypted": osd.get("encrypted", False),
+            "status": osd.get("status", "active"),
+            "description": osd.get("description", ""),
+        }
+        # Capacity fields are only sent when the inventory provides them
+        record.update({field: osd[field] for field in CAPACITY_FIELDS if field in osd})
+        payload.append(record)
+    return payload
+
+
+def import_osds(client, stream, chunk_size=250, workers=4, upsert=False, cluster=None):
+    """
+    Stream OSDs from a YAML inventory into NetBox in chunks sent concurrently
+    over `workers` connections.  Returns (totals, errors).
+    """
+    reader = InventoryReader(stream)
+    send = client.upsert_osds if upsert else client.create_osds
+    device_ids = {}
+    cluster_id = None
+    totals = Counter()
+    errors = []
+
+    def collect(futures):
+        for future in futures:
+            try:
+                result = future.result()
+            except requests.RequestException as e:
+                errors.append(str(e))
+                continue
+            if upsert:
+                totals.update(result)
+            else:
+                totals["created"] += result
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        for osds in batched(reader, chunk_size):
+            if cluster_id is None and (name := cluster or reader.header.get("cluster")):
+                if (cluster_id := client.resolve_names("/api/plugins/osd/clusters/", {name}).get(name)) is None:
+                    raise ValueError(f"Cluster '{name}' not found in NetBox")
+
+            # Resolve only the devices not seen in earlier chunks
+            if unknown := {osd["device"] for osd in osds} - device_ids.keys():
+                resolved = client.resolve_names("/api/dcim/devices/", unknown)
+                for name in sorted(unknown):
+                    device_ids[name] = resolved.get(name)
+                    if device_ids[name] is None:
+                        errors.append(f"Device '{name}' not found in NetBox (or not unique)")
+            payload = build_payload(osds, cluster_id, device_ids)
+            totals["skipped"] += len(osds) - len(payload)
+
+            # Bound the number of chunks in flight so memory stays flat
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                collect(done)
+            if payload:
+                pending.add(pool.submit(send, payload))
+
+        collect(pending)
+
+    return totals, errors
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog="netbox-osd", description="Manage Ceph OSDs in NetBox")
+    parser.add_argument("--url", default=os.environ.get("NETBOX_URL", "http://localhost:8000"))
+    parser.add_argument("--token", default=os.environ.get("NETBOX_TOKEN", ""))
+    parser.add_argument("--retries", type=int, default=5)
+    parser.add_argument("--timeout", type=int, default=120)
+    parser.add_argument("--no-verify", action="store_true", help="Skip TLS certificate verification")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    import_parser = subparsers.add_parser("import", help="Import OSDs from a YAML inventory")
+    import_parser.add_argument("file", help="YAML inventory (see examples/osds.yaml), or - for stdin")
+    import_parser.add_argument("--cluster", help="Cluster name (overrides the file's 'cluster' key)")
+    import_parser.add_argument("--chunk-size", type=int, default=250, help="OSDs per request")
+    import_parser.add_argument("--workers", type=int, default=4, help="Concurrent requests")
+    import_parser.add_argument(
+        "--upsert",
+        action="store_true",
+        help="Create or update OSDs by (device, name) instead of only creating them",
+    )
+
+    args = parser.parse_args(argv)
+    if not args.token:
+        parser.error("Set NETBOX_TOKEN or pass --token")
+
+    client = NetBoxClient(
+        args.url,
+        args.token,
+        retries=args.retries,
+        timeout=args.timeout,
+        verify=not args.no_verify,
+    )
+    stream = sys.stdin if args.file == "-" else open(args.file)
+    try:
+        totals, errors = import_osds(
+            client,
+            stream,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            upsert=args.upsert,
+            cluster=args.cluster,
+        )
+    except (ValueError, requests.RequestException) as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        return 1
+    finally:
+        stream.close()
+
+    print(", ".join(f"{key} {count}" for key, count in sorted(totals.items())) or "Nothing to import")
+    for error in errors:
+        print(f"ERROR: {error}", file=sys.stderr)
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
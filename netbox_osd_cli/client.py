@@ -0,0 +1,91 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+OSD_ENDPOINT = "/api/plugins/osd/osds/"
+UPSERT_ENDPOINT = "/api/plugins/osd/osds/upsert/"
+
+# Names per `?name=` multi-value lookup; keeps request URLs well below common limits
+NAME_BATCH_SIZE = 100
+
+
+class NetBoxClient:
+    """
+    Minimal NetBox REST client.  Each thread gets its own keep-alive session;
+    idempotent requests (GET/PUT/PATCH) are retried with exponential backoff
+    on connection errors and 429/5xx responses.  POSTs are only retried when
+    the connection failed before the request was sent.
+    """
+
+    def __init__(self, url, token, retries=5, backoff=0.5, timeout=120, verify=True):
+        self.url = url.rstrip("/")
+        self.token = token
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.verify = verify
+        self._local = threading.local()
+
+    @property
+    def session(self):
+        if not hasattr(self._local, "session"):
+            retry = Retry(
+                total=self.retries,
+                backoff_factor=self.backoff,
+                status_forcelist=(429, 502, 503, 504),
+                allowed_methods=frozenset({"GET", "PUT", "PATCH"}),
+            )
+            session = requests.Session()
+            session.mount("http://", HTTPAdapter(max_retries=retry))
+            session.mount("https://", HTTPAdapter(max_retries=retry))
+            session.verify = self.verify
+            session.headers.update({
+                "Authorization": f"Token {self.token}",
+                "Content-Type": "application/json",
+                "Accept": "application/json",
+            })
+            self._local.session = session
+        return self._local.session
+
+    def request(self, method, path, **kwargs):
+        url = path if path.startswith(("http://", "https://")) else f"{self.url}{path}"
+        r = self.session.request(method, url, timeout=self.timeout, **kwargs)
+        if not r.ok:
+            raise requests.HTTPError(f"{method} {path} failed ({r.status_code}): {r.text}", response=r)
+        return r.json()
+
+    def get_all(self, path, params):
+        """
+        GET every page of a list endpoint and return the combined results.
+        """
+        params = [*params, ("limit", 1000)]
+        results = []
+        data = self.request("GET", path, params=params)
+        while True:
+            results.extend(data["results"])
+            if not data.get("next"):
+                return results
+            data = self.request("GET", data["next"])
+
+    def resolve_names(self, path, names):
+        """
+        Resolve object names to IDs using batched ``?name=`` multi-value
+        queries.  Returns ``{name: ID}``; names matching more than one object
+        map to ``None``.
+        """
+        names = sorted(names)
+        resolved = {}
+        for start in range(0, len(names), NAME_BATCH_SIZE):
+            batch = names[start:start + NAME_BATCH_SIZE]
+            params = [("name", name) for name in batch] + [("fields", "id,name")]
+            for obj in self.get_all(path, params):
+                resolved[obj["name"]] = None if obj["name"] in resolved else obj["id"]
+        return resolved
+
+    def create_osds(self, payload):
+        return len(self.request("POST", OSD_ENDPOINT, json=payload))
+
+    def upsert_osds(self, payload):
+        return self.request("PATCH", UPSERT_ENDPOINT, json=payload)
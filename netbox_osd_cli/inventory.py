@@ -0,0 +1,63 @@
+import yaml
+
+
+class InventoryReader:
+    """
+    Stream OSD entries out of a YAML inventory file without loading it whole.
+
+    The file is a mapping with an ``osds`` list and optional top-level keys
+    such as ``cluster`` (see examples/osds.yaml).  Iterating yields one dict
+    per OSD; top-level keys are collected in ``header`` as they are reached,
+    so keys written before ``osds`` are available from the first OSD on.
+    """
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.header = {}
+
+    def __iter__(self):
+        events = yaml.parse(self.stream, Loader=yaml.SafeLoader)
+        for event in events:
+            if isinstance(event, yaml.MappingStartEvent):
+                break
+            if not isinstance(event, (yaml.StreamStartEvent, yaml.DocumentStartEvent)):
+                raise ValueError("Inventory must be a YAML mapping")
+
+        for event in events:
+            if isinstance(event, yaml.MappingEndEvent):
+                return
+            key = event.value
+            node = next(events)
+            if key != "osds":
+                self.header[key] = self.load(node, events)
+                continue
+            if not isinstance(node, yaml.SequenceStartEvent):
+                raise ValueError("'osds' must be a list")
+            for item in events:
+                if isinstance(item, yaml.SequenceEndEvent):
+                    break
+                yield self.load(item, events)
+
+    @staticmethod
+    def load(first, events):
+        """
+        Consume the events making up one node (starting with `first`) and
+        return it as a Python object.
+        """
+        collected = [first]
+        depth = int(isinstance(first, (yaml.MappingStartEvent, yaml.SequenceStartEvent)))
+        while depth:
+            event = next(events)
+            collected.append(event)
+            if isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+        document = yaml.emit([
+            yaml.StreamStartEvent(),
+            yaml.DocumentStartEvent(),
+            *collected,
+            yaml.DocumentEndEvent(),
+            yaml.StreamEndEvent(),
+        ])
+        return yaml.safe_load(document)